@@ -0,0 +1,1412 @@
+#!/usr/bin/env python3
+# Solana Address Scanner - Enhanced Backend
+# This script scans Solana addresses and checks for security issues
+
+import asyncio
+import json
+import time
+import logging
+from datetime import datetime
+import base58
+from typing import Dict, List, Any, Optional
+import os
+import socket
+import csv
+import re
+
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
+from fastapi.staticfiles import StaticFiles
+from pydantic import BaseModel
+import uvicorn
+
+from cache import Cache, FRESH, STALE
+from metrics import HistogramFamily, render_samples
+from pubsub import SubscriptionEngine, websocket_url
+from rpc_client import SolanaRpcClient
+from rpc_scheduler import RpcScheduler, rpc_priority, PRIORITY_BACKGROUND
+from shared_store import open_store, DEFAULT_DB_PATH as DEFAULT_STORE_PATH
+from sharding import HashRing
+from task_queue import TaskQueue
+from token_registry import TokenRegistry, DEFAULT_DB_PATH, DEFAULT_SNAPSHOT_PATH
+from tx_store import TransactionStore, TransactionIngester, DEFAULT_DB_PATH as DEFAULT_TX_DB_PATH
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.FileHandler("solana_scanner.log"),
+        logging.StreamHandler()
+    ]
+)
+logger = logging.getLogger("solana_scanner")
+
+# Initialize FastAPI app
+app = FastAPI(title="Solana Address Scanner API")
+
+# Add CORS middleware to allow cross-origin requests
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],  # Adjust this in production
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+# Configuration
+# For RPC endpoint, replace this with your dedicated endpoint from QuickNode, Helius, etc.
+SOLANA_RPC_URL = os.environ.get("SOLANA_RPC_URL", "https://api.mainnet-beta.solana.com")
+
+# API key for price data
+COIN_API_KEY = os.environ.get("COIN_API_KEY", "")
+
+# Per-call timeout (seconds) and connection pool size for the shared RPC client
+RPC_TIMEOUT = float(os.environ.get("RPC_TIMEOUT", 10))
+RPC_MAX_CONNECTIONS = int(os.environ.get("RPC_MAX_CONNECTIONS", 100))
+
+# Bulk scan tuning: addresses per getMultipleAccounts call (RPC max is 100),
+# calls per JSON-RPC batch request, and concurrent per-wallet lookups
+SCAN_BATCH_SIZE = min(int(os.environ.get("SCAN_BATCH_SIZE", 100)), 100)
+SCAN_RPC_BATCH = int(os.environ.get("SCAN_RPC_BATCH", 10))
+SCAN_CONCURRENCY = int(os.environ.get("SCAN_CONCURRENCY", 10))
+SCAN_INTERVAL = int(os.environ.get("SCAN_INTERVAL", 60))
+
+# Fields that fall back to their last known value when a lookup fails,
+# listed in the order update_account_data refreshes them
+STALE_FIELDS = ("balance", "recentTransactions", "portfolio", "nfts")
+
+# Most distinct addresses accepted by one POST /api/scan request
+SCAN_MAX_ADDRESSES = int(os.environ.get("SCAN_MAX_ADDRESSES", 500))
+
+# Push-based tracking over the node's PubSub WebSocket. With it enabled the
+# polling sweep only runs as a slow safety net (every SAFETY_SWEEP_INTERVAL
+# seconds) to catch anything a dropped notification missed
+SOLANA_WS_URL = os.environ.get("SOLANA_WS_URL", websocket_url(SOLANA_RPC_URL))
+PUBSUB_ENABLED = os.environ.get("PUBSUB_ENABLED", "1") != "0"
+PUBSUB_CONNECTIONS = int(os.environ.get("PUBSUB_CONNECTIONS", 1))
+PUBSUB_DEBOUNCE = float(os.environ.get("PUBSUB_DEBOUNCE", 0.25))
+SAFETY_SWEEP_INTERVAL = int(os.environ.get("SAFETY_SWEEP_INTERVAL", 900))
+
+# Multi-worker deployment: WEB_CONCURRENCY worker processes share account
+# snapshots, history and the tracked wallet set through STORE_URL (a SQLite
+# file by default, or redis://host:port/db). Each address is owned by one
+# live worker, chosen by consistent hashing, which sweeps it and holds its
+# PubSub subscriptions; updates are relayed through the store so any worker
+# can serve any client
+WEB_CONCURRENCY = int(os.environ.get("WEB_CONCURRENCY", 1))
+WORKER_ID = os.environ.get("WORKER_ID", f"{socket.gethostname()}-{os.getpid()}")
+STORE_URL = os.environ.get("STORE_URL", DEFAULT_STORE_PATH)
+STORE_RELAY_INTERVAL = float(os.environ.get("STORE_RELAY_INTERVAL", 0.1))
+WORKER_TTL = float(os.environ.get("WORKER_TTL", 15))
+
+# Tracked wallets no client has watched (subscribed to or requested) for
+# this long are dropped from the tracked set and their subscriptions closed
+TRACK_IDLE_EXPIRY = float(os.environ.get("TRACK_IDLE_EXPIRY", 86400))
+
+# Background refreshes run on a fixed pool of task queue workers
+TASK_WORKERS = int(os.environ.get("TASK_WORKERS", 8))
+
+# Messages buffered per WebSocket client before it is considered too slow and resynced
+WS_QUEUE_SIZE = int(os.environ.get("WS_QUEUE_SIZE", 256))
+
+# Request budget for the RPC provider: overall requests per second, plus
+# optional per-method limits, e.g. "getTokenAccountsByOwner=4,getSignaturesForAddress=5".
+# These are the budgets for the whole deployment: every live worker in the
+# ring gets an equal share (WEB_CONCURRENCY is assumed until the ring is known)
+RPC_RATE_LIMIT = float(os.environ.get("RPC_RATE_LIMIT", 10))
+RPC_METHOD_LIMITS = {
+    method.strip(): float(rate)
+    for method, rate in (
+        item.split("=", 1) for item in os.environ.get("RPC_METHOD_LIMITS", "").split(",") if "=" in item
+    )
+}
+RPC_MAX_RETRIES = int(os.environ.get("RPC_MAX_RETRIES", 5))
+
+# Shared async RPC client (keep-alive pooling, HTTP/2 when available), with
+# every call going through the rate-limit-aware scheduler
+rpc = RpcScheduler(
+    SolanaRpcClient(SOLANA_RPC_URL, timeout=RPC_TIMEOUT, max_connections=RPC_MAX_CONNECTIONS),
+    rate=RPC_RATE_LIMIT,
+    method_rates=RPC_METHOD_LIMITS,
+    max_retries=RPC_MAX_RETRIES
+)
+rpc.share(WEB_CONCURRENCY)
+
+# Token metadata lives in an on-disk registry seeded from a shipped snapshot
+# and refreshed from the token list in the background (24 hours by default)
+TOKEN_LIST_URL = os.environ.get("TOKEN_LIST_URL", "https://token.jup.ag/all")
+TOKEN_LIST_REFRESH = int(os.environ.get("TOKEN_LIST_REFRESH", 86400))
+token_registry = TokenRegistry(
+    os.environ.get("TOKEN_REGISTRY_PATH", DEFAULT_DB_PATH),
+    os.environ.get("TOKEN_REGISTRY_SNAPSHOT", DEFAULT_SNAPSHOT_PATH)
+)
+
+# Transaction history: per-address signature cursors persisted in SQLite, so
+# each scan only fetches new signatures, while older history is back-filled
+# in the background (up to TX_BACKFILL_MAX signatures per address)
+tx_store = TransactionStore(os.environ.get("TX_STORE_PATH", DEFAULT_TX_DB_PATH))
+tx_ingester = TransactionIngester(
+    tx_store,
+    rpc,
+    backfill_max=int(os.environ.get("TX_BACKFILL_MAX", 50000)),
+    backfill_workers=int(os.environ.get("TX_BACKFILL_WORKERS", 2))
+)
+
+# Shared state, this worker's view of which addresses it owns, and the job queue
+store = open_store(STORE_URL, WORKER_ID)
+ring = HashRing()
+tasks = TaskQueue(workers=TASK_WORKERS)
+
+# Wallets followed through accountSubscribe / programSubscribe notifications
+pubsub = SubscriptionEngine(SOLANA_WS_URL, pool_size=PUBSUB_CONNECTIONS)
+
+# Caches are bounded (LRU) and keyed by their actual lookup arguments
+CACHE_MAX_ENTRIES = int(os.environ.get("CACHE_MAX_ENTRIES", 10000))
+
+# Initialize caches
+# Token accounts are served stale for up to 10 minutes while a background refresh runs
+token_accounts_cache = Cache(expiry_seconds=30, stale_seconds=600, negative_seconds=15,
+                             max_entries=CACHE_MAX_ENTRIES)
+price_cache = Cache(expiry_seconds=300, max_entries=1000)  # 5 minute cache for prices, one entry per symbol
+security_cache = Cache(expiry_seconds=3600, max_entries=CACHE_MAX_ENTRIES)  # 1 hour cache for security issues
+
+# Time from the start of update_account_data until each loading stage is published
+update_stage_latency = HistogramFamily("solana_update_stage_seconds", "stage",
+                                       "Time from the start of an account refresh until each stage was published")
+
+# This worker's mirror of the account snapshots in the shared store
+address_data = {}
+connected_clients = set()
+background_tasks = set()  # Keep references to long-running background loops
+tracked_addresses = set()  # Wallets already recorded as tracked in the shared store
+notified_balances = {}  # address -> SOL balance carried by the latest account notification
+recently_watched = set()  # Wallets requested since the last heartbeat, to mark as watched in the store
+
+class ClientConnection:
+    """A connected WebSocket client with its own send queue and subscriptions."""
+
+    def __init__(self, websocket: WebSocket, queue_size: int):
+        self.websocket = websocket
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.subscriptions = set()
+        self.sender = None
+
+    async def send_loop(self):
+        # Sends happen here, off the publish path, so a slow tab only backs up its own queue
+        while True:
+            message = await self.queue.get()
+            try:
+                await self.websocket.send_text(message)
+            except Exception as e:
+                logger.error(f"Error sending message: {e}")
+                return
+
+class PublishedState:
+    """Last published record for an address, kept as pre-serialized JSON fields."""
+
+    def __init__(self):
+        self.version = 0
+        self.fields = {}
+
+    def snapshot(self) -> str:
+        return "{" + ",".join(f"{json.dumps(key)}:{value}" for key, value in self.fields.items()) + "}"
+
+class ConnectionManager:
+    def __init__(self, queue_size: int = 256):
+        self.active_connections = []
+        self.subscribers = {}  # address -> set of ClientConnection
+        self.published = {}  # address -> PublishedState
+        self.queue_size = queue_size
+
+    async def connect(self, websocket: WebSocket) -> ClientConnection:
+        await websocket.accept()
+        client = ClientConnection(websocket, self.queue_size)
+        client.sender = asyncio.create_task(client.send_loop())
+        self.active_connections.append(client)
+        logger.info(f"Client connected. Total connections: {len(self.active_connections)}")
+        return client
+
+    def disconnect(self, client: ClientConnection):
+        if client not in self.active_connections:
+            return
+        self.active_connections.remove(client)
+        client.sender.cancel()
+        for address in client.subscriptions:
+            subscribers = self.subscribers.get(address)
+            if subscribers:
+                subscribers.discard(client)
+                if not subscribers:
+                    del self.subscribers[address]
+        logger.info(f"Client disconnected. Total connections: {len(self.active_connections)}")
+
+    def enqueue(self, client: ClientConnection, message: str):
+        """Queue a message for a client without waiting on its socket."""
+        try:
+            client.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # The client fell too far behind for deltas to be useful: drop the
+            # backlog and let it catch up from fresh snapshots instead
+            logger.warning(f"Client send queue full, resyncing {len(client.subscriptions)} addresses")
+            while not client.queue.empty():
+                client.queue.get_nowait()
+            # Leave room for the message being queued unless the snapshots supersede it
+            is_delta = message.startswith('{"type":"account_delta"')
+            room = self.queue_size if is_delta else self.queue_size - 1
+            for address in list(client.subscriptions)[:room]:
+                if address in self.published:
+                    client.queue.put_nowait(self._snapshot_message(address))
+            if not is_delta:
+                client.queue.put_nowait(message)
+
+    def _snapshot_message(self, address: str) -> str:
+        state = self.published[address]
+        return f'{{"type":"account_update","version":{state.version},"data":{state.snapshot()}}}'
+
+    def subscribe(self, client: ClientConnection, addresses: List[str]):
+        """Subscribe a client to addresses and send it the current data for them."""
+        known = []
+        for address in addresses:
+            if address in address_data:
+                # Flush pending changes to existing subscribers before joining,
+                # so the snapshot below is the base for the next delta
+                self.publish(address)
+                known.append(address)
+            client.subscriptions.add(address)
+            self.subscribers.setdefault(address, set()).add(client)
+        if known:
+            self.send_full_update(client, known)
+
+    def unsubscribe(self, client: ClientConnection, addresses: List[str]):
+        for address in addresses:
+            client.subscriptions.discard(address)
+            subscribers = self.subscribers.get(address)
+            if subscribers:
+                subscribers.discard(client)
+                if not subscribers:
+                    del self.subscribers[address]
+
+    def send_full_update(self, client: ClientConnection, addresses: List[str]):
+        """Send complete records (and their versions) for the given addresses."""
+        states = [(address, self.published[address]) for address in addresses if address in self.published]
+        versions = ",".join(f"{json.dumps(address)}:{state.version}" for address, state in states)
+        data = ",".join(state.snapshot() for _, state in states)
+        self.enqueue(client, f'{{"type":"full_update","versions":{{{versions}}},"data":[{data}]}}')
+
+    def resync(self, client: ClientConnection, address: str):
+        if address in self.published:
+            self.enqueue(client, self._snapshot_message(address))
+
+    def publish(self, address: str):
+        """Send whatever changed in address_data[address] to that address's subscribers.
+
+        Each field is serialized once per publish and compared with what was
+        sent last time, so later loading stages only carry the fields that
+        changed, and the same message text is shared by every subscriber.
+        """
+        record = address_data.get(address)
+        if record is None:
+            return
+        state = self.published.setdefault(address, PublishedState())
+        fields = {key: json.dumps(value) for key, value in record.items()}
+        changed = {key: value for key, value in fields.items() if state.fields.get(key) != value}
+        removed = [key for key in state.fields if key not in fields]
+        if not changed and not removed and state.version:
+            return
+
+        state.version += 1
+        state.fields = fields
+
+        subscribers = self.subscribers.get(address)
+        if not subscribers:
+            return
+        if state.version == 1:
+            # Nobody has a base to apply a delta to yet
+            message = self._snapshot_message(address)
+        else:
+            changes = ",".join(f"{json.dumps(key)}:{value}" for key, value in changed.items())
+            message = (f'{{"type":"account_delta","address":{json.dumps(address)},"version":{state.version},'
+                       f'"changes":{{{changes}}},"removed":{json.dumps(removed)}}}')
+        for client in subscribers:
+            self.enqueue(client, message)
+
+    def send_to_subscribers(self, address: str, message: dict):
+        """Send a one-off message (e.g. an error) to everyone watching an address."""
+        text = json.dumps(message)
+        for client in self.subscribers.get(address, ()):
+            self.enqueue(client, text)
+
+manager = ConnectionManager(queue_size=WS_QUEUE_SIZE)
+
+def publish_account(address: str):
+    """Send a changed record to this worker's subscribers and queue it for the shared store."""
+    manager.publish(address)
+    store.save(address, address_data[address])
+
+async def get_account_balance(address: str) -> Optional[float]:
+    """Get account balance in SOL, or None if it could not be fetched."""
+    try:
+        result = await rpc.call("getBalance", [address])
+        
+        if 'value' in result:
+            # Convert lamports to SOL (1 SOL = 1,000,000,000 lamports)
+            balance_sol = result['value'] / 1_000_000_000
+            return balance_sol
+        else:
+            logger.error(f"Unexpected response format: {result}")
+            return None
+    except Exception as e:
+        logger.error(f"Error getting balance for {address}: {e}")
+        return None
+
+async def get_token_accounts(address: str) -> Optional[list]:
+    """Get token accounts owned by this wallet address, or None on failure."""
+    return await token_accounts_cache.get_or_load(
+        ("token_accounts", address),
+        lambda: fetch_token_accounts(address)
+    )
+
+async def fetch_token_accounts(address: str) -> Optional[list]:
+    """Fetch token accounts from the RPC node, bypassing the cache."""
+    try:
+        result = await rpc.call("getTokenAccountsByOwner", [
+            address,
+            {
+                "programId": "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"
+            },
+            {
+                "encoding": "jsonParsed"
+            }
+        ])
+        
+        if 'value' in result:
+            return result['value']
+        else:
+            logger.error(f"Unexpected response format for token accounts: {result}")
+            return None
+    except Exception as e:
+        logger.error(f"Error getting token accounts for {address}: {e}")
+        return None
+
+def unknown_token_metadata(mint_address: str) -> dict:
+    """Placeholder metadata for mints the registry doesn't know."""
+    return {
+        "name": f"Unknown Token ({mint_address[:6]}...)",
+        "symbol": "???",
+        "logo": "",
+        "address": mint_address,
+        "decimals": 9
+    }
+
+def get_tokens_metadata(mint_addresses: List[str]) -> Dict[str, dict]:
+    """Get metadata for all of a wallet's mints with one registry lookup."""
+    found = token_registry.get_many(mint_addresses)
+    return {mint: found.get(mint) or unknown_token_metadata(mint) for mint in mint_addresses}
+
+async def get_token_prices(symbols: List[str]) -> Dict[str, float]:
+    """Get token prices from CoinGecko or other price API."""
+    prices = {}
+    
+    # Check cache first - prices are cached per symbol, so only the
+    # symbols we haven't seen recently need an API call
+    missing = []
+    for symbol in dict.fromkeys(s.upper() for s in symbols):
+        cached = price_cache.get(("price", symbol))
+        if cached is not None:
+            prices[symbol] = cached
+        else:
+            missing.append(symbol)
+    
+    # First, try to get real prices from CoinGecko if API key is set
+    if COIN_API_KEY and missing:
+        try:
+            # Convert symbols to CoinGecko IDs (simplified mapping)
+            symbol_to_id = {
+                "SOL": "solana",
+                "BTC": "bitcoin",
+                "ETH": "ethereum",
+                "USDC": "usd-coin",
+                "USDT": "tether",
+                "RAY": "raydium",
+                "SRM": "serum",
+                "BONK": "bonk",
+                "SAMO": "samoyedcoin",
+                # Add more mappings as needed
+            }
+            
+            # Get IDs for the symbols we have
+            ids = [symbol_to_id[s] for s in missing if s in symbol_to_id]
+            
+            if ids:
+                # Example for CoinGecko
+                ids_param = ",".join(ids)
+                url = f"https://api.coingecko.com/api/v3/simple/price?ids={ids_param}&vs_currencies=usd&x_cg_demo_api_key={COIN_API_KEY}"
+                data = await rpc.get_json(url)
+                
+                # Map back from CoinGecko IDs to symbols
+                id_to_symbol = {v: k for k, v in symbol_to_id.items()}
+                
+                for coin_id, price_data in data.items():
+                    if coin_id in id_to_symbol and 'usd' in price_data:
+                        symbol = id_to_symbol[coin_id]
+                        prices[symbol] = price_data['usd']
+                        price_cache.set(("price", symbol), price_data['usd'])
+        
+        except Exception as e:
+            logger.error(f"Error getting prices from API: {e}")
+    
+    # Fallback to realistic estimates for any missing tokens
+    default_prices = {
+        "SOL": 111.45,
+        "USDC": 1.00,
+        "USDT": 1.00,
+        "BTC": 64000.00,
+        "ETH": 3500.00,
+        "RAY": 0.54,
+        "SRM": 0.22,
+        "BONK": 0.00002,
+        "SAMO": 0.015,
+        "WSOL": 111.45,
+    }
+    
+    # Fill in any missing prices with default data (not cached, so a real
+    # price replaces the estimate as soon as the API answers)
+    for symbol in symbols:
+        if symbol.upper() not in prices:
+            prices[symbol.upper()] = default_prices.get(symbol.upper(), 0.1)
+    
+    return prices
+
+async def get_account_transactions(address: str, limit: int = 10) -> Optional[list]:
+    """Get recent transactions for an account, or None if they could not be brought up to date.
+    
+    Only signatures newer than the address's stored cursor are fetched; the
+    rest come from the local transaction store. When the sync fails, callers
+    can still fall back to the (possibly outdated) tx_store.recent().
+    """
+    if not await tx_ingester.sync(address):
+        return None
+    return await tx_store.recent(address, limit)
+
+async def get_nfts_by_owner(owner_address: str, limit: int = 50) -> Optional[list]:
+    """Get NFTs owned by this address using Helius API if available (None on failure)."""
+    if "helius" in SOLANA_RPC_URL:
+        # If using Helius, we can get NFTs
+        try:
+            result = await rpc.call("getAssetsByOwner", {
+                "ownerAddress": owner_address,
+                "page": 1,
+                "limit": limit,
+                "displayOptions": {
+                    "showFungible": False
+                }
+            })
+            
+            if 'items' in result:
+                return result['items']
+            else:
+                logger.error(f"Unexpected NFT response format: {result}")
+                return None
+        except Exception as e:
+            logger.error(f"Error getting NFTs: {e}")
+            return None
+    
+    # If not using Helius, return empty list
+    return []
+
+async def store_historical_data(address: str, total_value: float, previous_points: Optional[list] = None) -> list:
+    """Store a historical portfolio value point and return the wallet's history."""
+    if previous_points and previous_points[-1]["value"] == total_value:
+        # Nothing moved since the last point; don't grow the chart with duplicates
+        return previous_points
+    # Keep only the last 30 data points
+    return await store.append_history(address, {
+        "timestamp": datetime.now().isoformat(),
+        "value": total_value
+    }, keep=30)
+
+async def check_security_issues(address: str, transactions=None) -> dict:
+    """Check for security issues with a wallet."""
+    # Check cache first
+    cached = security_cache.get(("security", address))
+    if cached:
+        return cached
+    
+    security_issues = {
+        "status": "secure",  # Can be "secure", "warning", or "critical"
+        "issues": [],
+        "risk_score": 0,  # 0-100, higher is more risky
+        "last_checked": datetime.now().isoformat()
+    }
+    
+    # Make sure the transaction history has been synced if not provided
+    if transactions is None:
+        transactions = await get_account_transactions(address)
+    # History that could not be brought up to date would misreport recent activity
+    history = await tx_store.history_stats(address) if transactions is not None else None
+    
+    # Lookups that failed (e.g. rate limited) must not read as "no activity"
+    missing_data = []
+    
+    try:
+        # 1. Check for public leak/exposure of the address
+        # In a real implementation, you would query a security database
+        # This would be implemented with a proper API call to a security service
+        
+        # 2. Check for suspicious transaction patterns
+        # Implement with a proper security database lookup
+        suspicious_tx_count = 0
+        
+        # 3. Check for potentially dangerous token approvals
+        token_accounts = await get_token_accounts(address)
+        risky_approvals = 0
+        if token_accounts is None:
+            missing_data.append("token accounts")
+            token_accounts = []
+        
+        for account in token_accounts:
+            if 'data' in account['account'] and 'parsed' in account['account']['data']:
+                info = account['account']['data']['parsed']['info']
+                # Check for delegate approvals
+                if 'delegate' in info and info['delegate'] != address:
+                    risky_approvals += 1
+        
+        if risky_approvals > 0:
+            security_issues["issues"].append({
+                "type": "token_approvals",
+                "severity": "warning",
+                "description": f"Found {risky_approvals} active token approvals that may be risky.",
+                "details": "These approvals allow other programs to spend tokens in this wallet."
+            })
+            security_issues["status"] = "warning"
+            security_issues["risk_score"] += risky_approvals * 10
+        
+        # 4. Check wallet activity patterns (from the stored history)
+        if history is None:
+            missing_data.append("transactions")
+        elif history["last30Days"] == 0:
+            security_issues["issues"].append({
+                "type": "inactive_wallet",
+                "severity": "info",
+                "description": "No activity detected on this wallet in the last 30 days.",
+                "details": "Inactive wallets may indicate dormant or abandoned accounts."
+            })
+        
+        # 5. Age of the wallet, from the oldest signature in its history. While
+        # the back-fill is still running (or after it stopped at TX_BACKFILL_MAX)
+        # that is only a lower bound, so a young age is only reported once the
+        # full history is known
+        wallet_age_days = 0
+        if history and history["oldestBlockTime"]:
+            current_time = int(time.time())
+            wallet_age_days = (current_time - history["oldestBlockTime"]) / (60 * 60 * 24)
+        
+        if history is not None and history["historyComplete"] and wallet_age_days < 7:
+            security_issues["issues"].append({
+                "type": "new_wallet",
+                "severity": "info",
+                "description": "This appears to be a recently created wallet.",
+                "details": f"Wallet age is approximately {wallet_age_days:.1f} days."
+            })
+        
+        # Cap risk score at 100
+        security_issues["risk_score"] = min(security_issues["risk_score"], 100)
+        
+    except Exception as e:
+        logger.error(f"Error checking security issues: {e}")
+        security_issues["issues"].append({
+            "type": "scan_error",
+            "severity": "info",
+            "description": "Error occurred during security scan.",
+            "details": str(e)
+        })
+    
+    if missing_data:
+        security_issues["issues"].append({
+            "type": "incomplete_scan",
+            "severity": "info",
+            "description": "Some checks were skipped because data could not be fetched.",
+            "details": f"Unavailable: {', '.join(missing_data)}. Will retry on the next refresh."
+        })
+    else:
+        # Only cache complete results so a transient failure isn't remembered for an hour
+        security_cache.set(("security", address), security_issues)
+    return security_issues
+
+def get_addresses_from_db():
+    """Get Solana addresses from database or configuration."""
+    # In a real implementation, you would fetch addresses from a database
+    # This function would be replaced with actual database queries
+    
+    # For now, return an empty list - addresses will be added by clients
+    return []
+
+def is_valid_address(address: str) -> bool:
+    """Check that a string is a base58-encoded 32 byte Solana public key."""
+    try:
+        return len(base58.b58decode(address)) == 32
+    except ValueError:
+        return False
+
+def chunked(items: list, size: int) -> List[list]:
+    """Split a list into consecutive chunks of at most `size` items."""
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+async def get_balances_batch(addresses: List[str]) -> Dict[str, float]:
+    """Get SOL balances for many addresses using batched getMultipleAccounts calls."""
+    balances = {}
+    chunks = chunked(addresses, SCAN_BATCH_SIZE)
+    calls = [
+        # Zero-length data slice: we only need lamports, not account data
+        ("getMultipleAccounts", [chunk, {"encoding": "base64", "dataSlice": {"offset": 0, "length": 0}}])
+        for chunk in chunks
+    ]
+    
+    for batch_start in range(0, len(calls), SCAN_RPC_BATCH):
+        batch_calls = calls[batch_start:batch_start + SCAN_RPC_BATCH]
+        batch_chunks = chunks[batch_start:batch_start + SCAN_RPC_BATCH]
+        try:
+            results = await rpc.call_batch(batch_calls)
+        except Exception as e:
+            logger.error(f"Error getting balances for batch of {sum(map(len, batch_chunks))} addresses: {e}")
+            continue
+        
+        for chunk, result in zip(batch_chunks, results):
+            if isinstance(result, Exception) or not isinstance(result, dict) or 'value' not in result:
+                logger.error(f"Unexpected getMultipleAccounts response: {result}")
+                continue
+            for address, account in zip(chunk, result['value']):
+                # Accounts that don't exist yet come back as null
+                lamports = account['lamports'] if account else 0
+                balances[address] = lamports / 1_000_000_000
+    
+    return balances
+
+async def scan_addresses(addresses: List[str]) -> dict:
+    """Scan many wallets in bulk and store the results in address_data.
+    
+    Balances are fetched with batched getMultipleAccounts calls; token
+    accounts, signatures and security checks run per wallet under a
+    bounded concurrency limit. Returns a throughput summary.
+    """
+    started = time.perf_counter()
+    addresses = list(dict.fromkeys(addresses))  # De-duplicate, keep order
+    semaphore = asyncio.Semaphore(SCAN_CONCURRENCY)
+    
+    balances = await get_balances_batch(addresses)
+    
+    async def scan_one(address: str) -> dict:
+        async with semaphore:
+            transactions, _ = await asyncio.gather(
+                get_account_transactions(address),
+                get_token_accounts(address)  # Warms the cache for the security check
+            )
+            security = await check_security_issues(address, transactions)
+        # Only include what was actually fetched; failed lookups keep the old values
+        record = {
+            "address": address,
+            "lastUpdated": datetime.now().isoformat(),
+            "security": security,
+            "history": await tx_store.history_stats(address)
+        }
+        if address in balances:
+            record["balance"] = balances[address]
+        if transactions is not None:
+            record["recentTransactions"] = transactions
+        return record
+    
+    records = await asyncio.gather(*(scan_one(a) for a in addresses), return_exceptions=True)
+    
+    # Write everything back in one pass, keeping any fuller data already loaded
+    updates = {}
+    failed = 0
+    for address, record in zip(addresses, records):
+        existing = address_data.get(address, {})
+        if isinstance(record, Exception):
+            logger.error(f"Error scanning {address}: {record}")
+            failed += 1
+            continue
+        if "balance" not in record and "balance" not in existing:
+            # Never publish an unknown balance as zero
+            failed += 1
+            continue
+        stale = [field for field in ("balance", "recentTransactions") if field not in record]
+        updates[address] = {
+            **existing,
+            **record,
+            "stale": stale,
+            "loadingStage": existing.get("loadingStage", "basic_info")
+        }
+    address_data.update(updates)
+    for address in updates:
+        # Only follow wallets whose balance was actually fetched
+        if address in balances:
+            await track_address(address)
+        publish_account(address)
+    
+    elapsed = time.perf_counter() - started
+    summary = {
+        "scanned": len(updates),
+        "failed": failed,
+        "elapsedSeconds": round(elapsed, 3),
+        "walletsPerSecond": round(len(updates) / elapsed, 2) if elapsed > 0 else 0.0
+    }
+    if addresses:
+        logger.info(f"Bulk scan: {summary['scanned']} wallets in {summary['elapsedSeconds']}s "
+                    f"({summary['walletsPerSecond']} wallets/s, {failed} failed)")
+    return summary
+
+def carry_forward_prices(portfolio: list, previous_portfolio: list):
+    """Value holdings at the unit prices of the previous portfolio and sort them like it.
+    
+    Unchanged holdings keep their exact previous value, so a refresh that
+    changes nothing doesn't re-send the portfolio before the prices stage.
+    """
+    previous_tokens = {token.get("mint", token.get("symbol")): token for token in previous_portfolio}
+    for token in portfolio:
+        before = previous_tokens.get(token.get("mint", token.get("symbol")))
+        if before is None or not before.get("balance"):
+            continue
+        if before["balance"] == token["balance"]:
+            token["usd_value"] = before.get("usd_value", 0)
+        else:
+            token["usd_value"] = token["balance"] * before.get("usd_value", 0) / before["balance"]
+    portfolio.sort(key=lambda x: x.get('usd_value', 0), reverse=True)
+
+async def update_account_data(address: str, balance: Optional[float] = None):
+    """Update stored data for an account and broadcast to clients.
+    
+    A balance that is already known (e.g. from an account notification) is
+    used as is rather than fetched again.
+    """
+    started = time.perf_counter()
+    
+    # Fire off the independent RPC lookups concurrently, then await them
+    # stage by stage so the whole refresh takes about as long as the
+    # slowest call rather than the sum of all of them
+    balance_task = asyncio.create_task(get_account_balance(address)) if balance is None else None
+    transactions_task = asyncio.create_task(get_account_transactions(address))
+    token_accounts_task = asyncio.create_task(get_token_accounts(address))
+    nfts_task = asyncio.create_task(get_nfts_by_owner(address))
+    
+    # Last known good data, used in place of any lookup that fails this time
+    previous = address_data.get(address, {})
+    stale = []
+    refreshed_at = datetime.now().isoformat()
+    
+    def stage_stale(pending: tuple) -> list:
+        # Fields whose stage hasn't run yet keep their previous staleness, so
+        # an unchanged refresh doesn't flip them back and forth
+        previous_stale = previous.get("stale", [])
+        return [field for field in STALE_FIELDS
+                if field in stale or (field in pending and field in previous_stale)]
+    
+    try:
+        # Start with progressive loading - first send basic data
+        # Get SOL balance
+        sol_balance = await balance_task if balance_task else balance
+        if sol_balance is None:
+            sol_balance = previous.get("balance")
+            stale.append("balance")
+        if sol_balance is None:
+            # Never push an unknown balance to clients as zero
+            manager.send_to_subscribers(address, {
+                "type": "account_error",
+                "address": address,
+                "message": "Balance unavailable right now (RPC rate limited or unreachable). Try again shortly."
+            })
+            return
+        
+        # Follow the wallet from now on so later changes are pushed to us,
+        # once the chain has confirmed it by returning a balance
+        if "balance" not in stale:
+            await track_address(address)
+        
+        # Get initial data
+        initial_data = {
+            "address": address,
+            "balance": sol_balance,
+            "lastUpdated": refreshed_at,
+            "loadingStage": "basic_info",
+            "stale": stage_stale(("recentTransactions", "portfolio", "nfts"))
+        }
+        if "portfolio" not in previous:
+            # First load: show the SOL holding until the token accounts arrive
+            initial_data["portfolio"] = [
+                {
+                    "type": "SOL",
+                    "name": "Solana",
+                    "symbol": "SOL",
+                    "balance": sol_balance,
+                    "usd_value": sol_balance * 111.45,  # Initial estimate
+                    "logo": "https://raw.githubusercontent.com/solana-labs/token-list/main/assets/mainnet/So11111111111111111111111111111111111111112/logo.png"
+                }
+            ]
+        
+        # Update stored data with initial info, keeping everything the later
+        # stages haven't refreshed yet so clients only receive what changed
+        address_data[address] = {**previous, **initial_data}
+        
+        # Broadcast initial update
+        publish_account(address)
+        update_stage_latency.observe("basic_info", time.perf_counter() - started)
+        
+        # Now get transactions
+        transactions = await transactions_task
+        if transactions is None:
+            transactions = previous.get("recentTransactions") or await tx_store.recent(address)
+            stale.append("recentTransactions")
+        address_data[address]["recentTransactions"] = transactions
+        address_data[address]["stale"] = stage_stale(("portfolio", "nfts"))
+        address_data[address]["loadingStage"] = "transactions"
+        
+        # Broadcast transactions update
+        publish_account(address)
+        update_stage_latency.observe("transactions", time.perf_counter() - started)
+        
+        # Get token accounts (this can be slow)
+        token_accounts = await token_accounts_task
+        if token_accounts is None:
+            token_accounts = []
+            stale.append("portfolio")
+        
+        # Process token balances
+        portfolio = [
+            {
+                "type": "SOL",
+                "name": "Solana",
+                "symbol": "SOL",
+                "balance": sol_balance,
+                "usd_value": sol_balance * 111.45,  # Will be updated with real price
+                "logo": "https://raw.githubusercontent.com/solana-labs/token-list/main/assets/mainnet/So11111111111111111111111111111111111111112/logo.png"
+            }
+        ]
+        
+        # Collect symbols for price lookup
+        symbols = ["SOL"]
+        
+        # Collect non-zero token balances first so metadata can be looked up in one batch
+        holdings = []
+        for account in token_accounts:
+            try:
+                if 'data' in account['account'] and 'parsed' in account['account']['data']:
+                    info = account['account']['data']['parsed']['info']
+                    
+                    if 'tokenAmount' in info:
+                        mint = info.get('mint', '')
+                        amount = int(info['tokenAmount']['amount'])
+                        decimals = info['tokenAmount']['decimals']
+                        
+                        if amount > 0:  # Only add tokens with non-zero balance
+                            holdings.append((mint, amount / (10 ** decimals)))
+            except Exception as e:
+                logger.error(f"Error processing token account: {e}")
+        
+        # Get token metadata for every mint at once
+        token_metadata = get_tokens_metadata([mint for mint, _ in holdings])
+        
+        # Add token balances to portfolio
+        for mint, token_balance in holdings:
+            token_meta = token_metadata[mint]
+            
+            # Add symbol to price lookup list
+            if token_meta.get("symbol", "???") != "???":
+                symbols.append(token_meta.get("symbol"))
+            
+            # Will update price later
+            token_data = {
+                "type": "SPL",
+                "mint": mint,
+                "name": token_meta.get("name", "Unknown Token"),
+                "symbol": token_meta.get("symbol", "???"),
+                "balance": token_balance,
+                "usd_value": 0,  # Will set this after getting prices
+                "logo": token_meta.get("logo", "")
+            }
+            
+            portfolio.append(token_data)
+        
+        if "portfolio" in stale:
+            # Carry the last known token holdings forward rather than dropping them
+            for token in previous.get("portfolio", []):
+                if token.get("type") == "SPL":
+                    portfolio.append(dict(token))
+                    if token.get("symbol", "???") != "???":
+                        symbols.append(token["symbol"])
+        
+        # Until fresh prices arrive, value holdings at their last known prices
+        carry_forward_prices(portfolio, previous.get("portfolio", []))
+        
+        # Update with token data
+        address_data[address]["portfolio"] = portfolio
+        address_data[address]["stale"] = stage_stale(("nfts",))
+        address_data[address]["loadingStage"] = "tokens"
+        
+        # Broadcast token update
+        publish_account(address)
+        update_stage_latency.observe("tokens", time.perf_counter() - started)
+        
+        # Now get prices for all tokens
+        token_prices = await get_token_prices(symbols)
+        update_stage_latency.observe("prices", time.perf_counter() - started)
+        
+        # Update portfolio with prices
+        for token in portfolio:
+            symbol = token.get("symbol", "").upper()
+            if symbol in token_prices:
+                token["usd_value"] = token["balance"] * token_prices[symbol]
+        
+        # Sort portfolio by USD value (descending)
+        portfolio.sort(key=lambda x: x.get('usd_value', 0), reverse=True)
+        
+        # Calculate total portfolio value
+        total_value = sum(item.get('usd_value', 0) for item in portfolio)
+        
+        # Try to get NFTs if using Helius
+        nfts = await nfts_task
+        if nfts is None:
+            nfts = previous.get("nfts", [])
+            stale.append("nfts")
+        
+        # Store historical data point
+        history_points = await store_historical_data(address, total_value, previous.get("historicalData"))
+        
+        # Check for security issues
+        security_issues = await check_security_issues(
+            address, None if "recentTransactions" in stale else transactions)
+        update_stage_latency.observe("security", time.perf_counter() - started)
+        
+        # Final data update
+        address_data[address] = {
+            **address_data[address],
+            "address": address,
+            "balance": sol_balance,
+            "lastUpdated": refreshed_at,
+            "recentTransactions": transactions,
+            "portfolio": portfolio,
+            "totalValue": total_value,
+            "nfts": nfts,
+            "historicalData": history_points,
+            "security": security_issues,
+            "history": await tx_store.history_stats(address),
+            "stale": stage_stale(()),
+            "loadingStage": "complete"
+        }
+        
+        # Broadcast final update
+        publish_account(address)
+        update_stage_latency.observe("complete", time.perf_counter() - started)
+        
+    except Exception as e:
+        logger.error(f"Error updating account data for {address}: {e}")
+    finally:
+        # Don't leave orphaned lookups running if an earlier stage failed
+        for task in (balance_task, transactions_task, token_accounts_task, nfts_task):
+            if task and not task.done():
+                task.cancel()
+
+def spawn_background(coro):
+    """Start a long-running background loop and keep a reference to it."""
+    task = asyncio.create_task(coro)
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+    return task
+
+def apply_token_account_change(owner: str, change: dict):
+    """Patch one token account from a notification into the cached list.
+    
+    Keeps the cached getTokenAccountsByOwner result current without another
+    RPC call; if nothing is cached, the next lookup simply fetches it.
+    """
+    key = ("token_accounts", owner)
+    state, accounts = token_accounts_cache.lookup(key)
+    if state not in (FRESH, STALE):
+        token_accounts_cache.delete(key)
+        return
+    account = change.get("account") or {}
+    accounts = [a for a in accounts if a.get("pubkey") != change.get("pubkey")]
+    # Closed accounts come back with no lamports and unparseable data
+    if account.get("lamports") and isinstance(account.get("data"), dict):
+        accounts.append(change)
+    token_accounts_cache.set(key, accounts)
+
+def handle_chain_notification(address: str, kind: str, value):
+    """React to a PubSub notification with a targeted refresh of one wallet."""
+    if kind == "account" and value is not None:
+        notified_balances[address] = value["lamports"] / 1_000_000_000
+    elif kind == "token" and value is not None:
+        apply_token_account_change(address, value)
+    else:
+        # Reconnected after a gap: notifications may have been missed
+        token_accounts_cache.delete(("token_accounts", address))
+        notified_balances.pop(address, None)
+    if kind != "account":
+        # Delegations live on the token accounts
+        security_cache.delete(("security", address))
+    
+    # Bursts of notifications (one transaction often touches the wallet and
+    # several token accounts) collapse into a single refresh
+    tasks.submit(("refresh", address), refresh_after_notification, address, delay=PUBSUB_DEBOUNCE)
+
+async def refresh_after_notification(address: str):
+    await update_account_data(address, balance=notified_balances.pop(address, None))
+
+async def track_address(address: str):
+    """Follow a wallet: record it as tracked and subscribe to it if this worker owns it."""
+    if not is_valid_address(address):
+        return  # An invalid key would fail every batched lookup it is grouped with
+    if address not in tracked_addresses:
+        await store.track(address)
+        tracked_addresses.add(address)
+    if ring.owns(WORKER_ID, address):
+        pubsub.track(address)
+
+def forget_address(address: str):
+    """Stop following a wallet that is no longer tracked; its stored data is kept."""
+    tracked_addresses.discard(address)
+    notified_balances.pop(address, None)
+    pubsub.untrack(address)
+    tx_ingester.stop_backfill(address)
+
+async def rebalance():
+    """Hold PubSub subscriptions for exactly the tracked wallets this worker owns."""
+    tracked = set(await store.tracked())
+    for address in tracked_addresses - tracked:
+        # Expired or untracked by another worker
+        forget_address(address)
+    tracked_addresses.update(tracked)
+    for address in tracked:
+        if ring.owns(WORKER_ID, address):
+            pubsub.track(address)
+        else:
+            pubsub.untrack(address)
+
+async def expire_unwatched():
+    """Mark the wallets clients are watching and drop those nobody has watched in TRACK_IDLE_EXPIRY."""
+    watched = (set(manager.subscribers) | recently_watched) & tracked_addresses
+    recently_watched.clear()
+    if watched:
+        await store.touch(sorted(watched))
+    expired = await store.expire_tracked(TRACK_IDLE_EXPIRY)
+    for address in expired:
+        forget_address(address)
+    if expired:
+        logger.info(f"Stopped tracking {len(expired)} wallet(s) unwatched for {TRACK_IDLE_EXPIRY:.0f}s")
+
+async def cluster_heartbeat():
+    """Announce this worker, follow ring membership changes and pick up newly tracked wallets."""
+    while True:
+        try:
+            await store.heartbeat()
+            if ring.rebuild(await store.live_workers(WORKER_TTL)):
+                logger.info(f"Worker {WORKER_ID}: {len(ring.workers)} live worker(s) in the ring")
+                rpc.share(len(ring.workers))
+            await expire_unwatched()
+            await rebalance()
+        except Exception as e:
+            logger.error(f"Error in cluster heartbeat: {e}")
+        await asyncio.sleep(WORKER_TTL / 3)
+
+async def relay_updates():
+    """Flush this worker's writes to the shared store and apply the other workers' updates."""
+    while True:
+        try:
+            await store.flush()
+            for address, record in await store.poll_updates():
+                address_data[address] = record
+                manager.publish(address)
+                # A wallet another worker just started following may be ours to
+                # subscribe to; don't wait for the next heartbeat to find out
+                if ring.owns(WORKER_ID, address):
+                    tracked_addresses.add(address)
+                    pubsub.track(address)
+        except Exception as e:
+            logger.error(f"Error relaying updates through the shared store: {e}")
+        await asyncio.sleep(STORE_RELAY_INTERVAL)
+
+async def periodic_scanner():
+    """Run periodic scan as a background task on the event loop.
+    
+    With PubSub tracking enabled this is only a slow safety-net sweep.
+    """
+    interval = SAFETY_SWEEP_INTERVAL if PUBSUB_ENABLED else SCAN_INTERVAL
+    while True:
+        try:
+            # Sweeps yield to interactive requests for the RPC budget
+            rpc_priority.set(PRIORITY_BACKGROUND)
+            
+            # Get current addresses from database, plus every tracked wallet,
+            # keeping only the share of them this worker owns
+            addresses = [
+                address for address in get_addresses_from_db() + sorted(await store.tracked())
+                if ring.owns(WORKER_ID, address)
+            ]
+            
+            # Refresh every tracked wallet in one bulk pass
+            await scan_addresses(addresses)
+            
+            # The data is updated here and will be sent when clients
+            # connect or request updates
+            
+        except Exception as e:
+            logger.error(f"Error in periodic scanner: {e}")
+        
+        # Sleep until the next sweep
+        await asyncio.sleep(interval)
+
+@app.websocket("/ws")
+async def websocket_endpoint(websocket: WebSocket):
+    client = await manager.connect(websocket)
+    try:
+        # Nothing is sent until the client subscribes to the addresses it is viewing
+        
+        # Keep connection alive and handle messages
+        while True:
+            data = await websocket.receive_text()
+            request = json.loads(data)
+            
+            if request["type"] == "subscribe":
+                addresses = [a for a in request.get("addresses", []) if is_valid_address(a)]
+                manager.subscribe(client, addresses)
+                recently_watched.update(addresses)
+                # Wallets restored from a client's saved list may have expired
+                # from the tracked set (or never been loaded here); bring them back
+                for address in addresses:
+                    if address not in tracked_addresses:
+                        tasks.submit(("refresh", address), update_account_data, address)
+            
+            elif request["type"] == "unsubscribe":
+                manager.unsubscribe(client, request.get("addresses", []))
+            
+            elif request["type"] == "get_account":
+                address = request.get("address")
+                if address and not is_valid_address(address):
+                    manager.enqueue(client, json.dumps({
+                        "type": "account_error",
+                        "address": address,
+                        "message": "Invalid Solana address"
+                    }))
+                elif address:
+                    # Watching an address implies subscribing to it; the refresh
+                    # runs on the task queue so this loop keeps reading messages
+                    manager.subscribe(client, [address])
+                    recently_watched.add(address)
+                    tasks.submit(("refresh", address), update_account_data, address)
+            
+            elif request["type"] == "resync":
+                # The client missed a delta; send it the full record again
+                manager.resync(client, request.get("address"))
+            
+            elif request["type"] == "refresh_all":
+                # Send current data for everything this client watches
+                manager.send_full_update(client, list(client.subscriptions))
+            
+    except WebSocketDisconnect:
+        manager.disconnect(client)
+    except Exception as e:
+        logger.error(f"WebSocket error: {e}")
+        manager.disconnect(client)
+
+@app.get("/api/accounts")
+async def get_accounts():
+    """API endpoint to get all tracked accounts."""
+    return JSONResponse({
+        "accounts": list(address_data.values())
+    })
+
+class ScanRequest(BaseModel):
+    addresses: List[str]
+
+@app.post("/api/scan")
+async def scan_accounts(scan_request: ScanRequest):
+    """API endpoint to bulk scan a list of accounts."""
+    requested = len(set(scan_request.addresses))
+    if requested > SCAN_MAX_ADDRESSES:
+        return JSONResponse({
+            "error": f"Too many addresses: at most {SCAN_MAX_ADDRESSES} per scan",
+            "requested": requested
+        }, status_code=413)
+    invalid = [a for a in scan_request.addresses if not is_valid_address(a)]
+    if invalid:
+        return JSONResponse({"error": "Invalid Solana addresses", "invalid": invalid}, status_code=400)
+    
+    summary = await scan_addresses(scan_request.addresses)
+    return JSONResponse({
+        **summary,
+        "accounts": [address_data[a] for a in dict.fromkeys(scan_request.addresses) if a in address_data]
+    })
+
+@app.get("/api/cache/stats")
+async def get_cache_stats():
+    """API endpoint to get hit, miss and eviction counters for each cache."""
+    return JSONResponse({
+        "token_accounts": token_accounts_cache.stats(),
+        "prices": price_cache.stats(),
+        "security": security_cache.stats()
+    })
+
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus-format metrics for this worker process."""
+    caches = {"token_accounts": token_accounts_cache, "prices": price_cache, "security": security_cache}
+    cache_stats = {name: cache.stats() for name, cache in caches.items()}
+    queue_depths = [client.queue.qsize() for client in manager.active_connections]
+    
+    lines = rpc.latency.render()
+    lines += render_samples("solana_rpc_errors_total", "counter", "Failed RPC attempts by method",
+                            {(("method", m),): n for m, n in rpc.method_errors.items()})
+    lines += render_samples("solana_rpc_rate_limited_total", "counter", "RPC attempts rejected with 429 by method",
+                            {(("method", m),): n for m, n in rpc.method_rate_limited.items()})
+    lines += render_samples("solana_rpc_scheduler_events_total", "counter",
+                            "RPC scheduler calls, retries, coalesced calls and failures",
+                            {(("event", event),): n for event, n in rpc.stats.items()})
+    lines += render_samples("solana_cache_hit_ratio", "gauge", "Share of cache lookups served from the cache",
+                            {(("cache", name),): stats["hit_ratio"] for name, stats in cache_stats.items()})
+    lines += render_samples("solana_cache_lookups_total", "counter", "Cache lookups by result",
+                            {(("cache", name), ("result", result)): stats[result]
+                             for name, stats in cache_stats.items()
+                             for result in ("hits", "stale_hits", "negative_hits", "misses")})
+    lines += render_samples("solana_cache_entries", "gauge", "Entries held by each cache",
+                            {(("cache", name),): stats["entries"] for name, stats in cache_stats.items()})
+    lines += render_samples("solana_ws_connections", "gauge", "Connected WebSocket clients",
+                            {(): len(queue_depths)})
+    lines += render_samples("solana_ws_queue_depth", "gauge", "Messages waiting in WebSocket send queues",
+                            {(("stat", "total"),): sum(queue_depths), (("stat", "max"),): max(queue_depths, default=0)})
+    lines += update_stage_latency.render()
+    lines += render_samples("solana_task_queue_jobs", "gauge", "Background jobs waiting and running",
+                            {(("state", "queued"),): tasks.queue.qsize(), (("state", "running"),): tasks.running})
+    lines += render_samples("solana_pubsub_notifications_total", "counter", "PubSub notifications received",
+                            {(): pubsub.stats["notifications"]})
+    return PlainTextResponse("\n".join(lines) + "\n", media_type="text/plain; version=0.0.4")
+
+@app.get("/api/cluster/status")
+async def get_cluster_status():
+    """API endpoint to get this worker's view of the cluster and its task queue."""
+    return JSONResponse({
+        "worker": WORKER_ID,
+        "workers": list(ring.workers),
+        "owned": sum(1 for a in tracked_addresses if ring.owns(WORKER_ID, a)),
+        "tracked": len(tracked_addresses),
+        "rpcRateLimit": rpc.global_bucket.rate,  # This worker's share of RPC_RATE_LIMIT
+        "tasks": tasks.status()
+    })
+
+@app.get("/api/pubsub/status")
+async def get_pubsub_status():
+    """API endpoint to get the state of the PubSub subscription engine."""
+    return JSONResponse({"enabled": PUBSUB_ENABLED, "url": SOLANA_WS_URL, **pubsub.status()})
+
+@app.get("/api/account/{address}")
+async def get_account(address: str):
+    """API endpoint to get data for a specific account."""
+    if not is_valid_address(address):
+        return JSONResponse({"error": "Invalid Solana address", "address": address}, status_code=400)
+    recently_watched.add(address)
+    if address in address_data:
+        return JSONResponse(address_data[address])
+    else:
+        # Fetch data first time
+        balance, transactions = await asyncio.gather(
+            get_account_balance(address),
+            get_account_transactions(address)
+        )
+        
+        if balance is None:
+            # Don't store or return a made-up zero balance
+            return JSONResponse({
+                "error": "Balance unavailable right now (RPC rate limited or unreachable)",
+                "address": address
+            }, status_code=503, headers={"Retry-After": "5"})
+        
+        # Store minimal data
+        address_data[address] = {
+            "address": address,
+            "balance": balance,
+            "lastUpdated": datetime.now().isoformat(),
+            "recentTransactions": transactions if transactions is not None else await tx_store.recent(address),
+            "stale": [] if transactions is not None else ["recentTransactions"],
+            "loadingStage": "basic_info"
+        }
+        store.save(address, address_data[address])
+        
+        # Load the rest in the background
+        tasks.submit(("refresh", address), update_account_data, address)
+        
+        return JSONResponse(address_data[address])
+
+@app.delete("/api/account/{address}")
+async def untrack_account(address: str):
+    """API endpoint to stop tracking an account; its stored data is kept."""
+    if not is_valid_address(address):
+        return JSONResponse({"error": "Invalid Solana address", "address": address}, status_code=400)
+    await store.untrack(address)
+    forget_address(address)
+    return JSONResponse({"address": address, "tracked": False})
+
+@app.on_event("startup")
+async def startup_event():
+    # Start from the snapshots other workers (or a previous run) left in the store
+    address_data.update(await store.load_accounts())
+    
+    # Join the ring before deciding which addresses are ours
+    await store.heartbeat()
+    ring.rebuild(await store.live_workers(WORKER_TTL))
+    rpc.share(len(ring.workers))
+    logger.info(f"Worker {WORKER_ID} started: {len(address_data)} accounts in the shared store, "
+                f"{len(ring.workers)} live worker(s)")
+    
+    tasks.start()
+    spawn_background(relay_updates())
+    spawn_background(cluster_heartbeat())
+    
+    # Start background scanner task
+    spawn_background(periodic_scanner())
+    
+    # Open the PubSub connection pool; notifications drive targeted refreshes
+    if PUBSUB_ENABLED:
+        pubsub.start(handle_chain_notification)
+    
+    # Resume transaction back-fills left over from the last run, for the
+    # tracked wallets this worker owns
+    await rebalance()
+    await tx_ingester.start(lambda address: address in tracked_addresses and ring.owns(WORKER_ID, address))
+    
+    # Keep the token registry fresh without making startup wait on the download
+    spawn_background(token_registry.refresh_periodically(rpc, TOKEN_LIST_URL, TOKEN_LIST_REFRESH))
+    
+    # Load initial data from database if available
+    addresses = [a for a in get_addresses_from_db() if ring.owns(WORKER_ID, a)]
+    balances = await asyncio.gather(*(get_account_balance(a) for a in addresses))
+    for address, balance in zip(addresses, balances):
+        if balance is None:
+            continue  # The periodic scanner will pick it up
+        address_data[address] = {
+            "address": address,
+            "balance": balance,
+            "lastUpdated": datetime.now().isoformat(),
+            "loadingStage": "basic_info"
+        }
+        store.save(address, address_data[address])
+        await track_address(address)
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    for task in list(background_tasks):
+        task.cancel()
+    await tasks.stop()
+    await pubsub.stop()
+    await rpc.close()
+    tx_ingester.stop()
+    # Write out anything not flushed yet and leave the ring
+    await store.flush()
+    await store.close()
+    token_registry.close()
+    await tx_store.close()
+
+if __name__ == "__main__":
+    # Read port from environment variable or use default
+    port = int(os.environ.get("PORT", 8000))
+    # Worker processes coordinate through the shared store; use
+    # `uvicorn app:app --reload` for auto-reload during development
+    uvicorn.run("app:app", host="0.0.0.0", port=port, workers=WEB_CONCURRENCY)
\ No newline at end of file
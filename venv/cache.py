@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# Solana Address Scanner - Cache layer
+# Bounded TTL + LRU cache with negative caching, stale-while-revalidate and counters
+
+import asyncio
+import logging
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger("solana_scanner")
+
+# Entry states returned by Cache.lookup
+FRESH = "fresh"
+STALE = "stale"
+NEGATIVE = "negative"
+MISS = "miss"
+
+
+class _Entry:
+    __slots__ = ("value", "expires", "stale_until", "negative")
+
+    def __init__(self, value: Any, expires: float, stale_until: float, negative: bool):
+        self.value = value
+        self.expires = expires
+        self.stale_until = stale_until
+        self.negative = negative
+
+
+class Cache:
+    """Bounded in-memory cache with TTL expiry and LRU eviction.
+
+    expiry_seconds   - how long an entry is fresh
+    stale_seconds    - how long past expiry an entry may still be served
+                       while a background refresh runs (stale-while-revalidate)
+    negative_seconds - how long a failed lookup is remembered
+    max_entries      - entry count bound; least recently used entries go first
+    """
+
+    def __init__(self, expiry_seconds: float = 300, max_entries: int = 1024,
+                 stale_seconds: float = 0, negative_seconds: float = 30):
+        self.expiry = expiry_seconds
+        self.stale = stale_seconds
+        self.negative_expiry = negative_seconds
+        self.max_entries = max_entries
+        self.data: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self.counters = Counter()
+        self._loading: Dict[Hashable, asyncio.Future] = {}
+        self._refreshing: Dict[Hashable, asyncio.Task] = {}
+
+    def __len__(self):
+        return len(self.data)
+
+    def lookup(self, key: Hashable):
+        """Return (state, value) for a key without loading anything."""
+        entry = self.data.get(key)
+        if entry is None:
+            return MISS, None
+
+        now = time.monotonic()
+        if now < entry.expires:
+            self.data.move_to_end(key)
+            return (NEGATIVE if entry.negative else FRESH), entry.value
+        if not entry.negative and now < entry.stale_until:
+            self.data.move_to_end(key)
+            return STALE, entry.value
+
+        del self.data[key]
+        self.counters["expirations"] += 1
+        return MISS, None
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return a fresh value, or `default` on a miss, expiry or cached failure."""
+        state, value = self.lookup(key)
+        if state == FRESH:
+            self.counters["hits"] += 1
+            return value
+        if state == NEGATIVE:
+            self.counters["negative_hits"] += 1
+        else:
+            self.counters["misses"] += 1
+        return default
+
+    def set(self, key: Hashable, value: Any, expiry_seconds: Optional[float] = None):
+        expiry = self.expiry if expiry_seconds is None else expiry_seconds
+        now = time.monotonic()
+        self._store(key, _Entry(value, now + expiry, now + expiry + self.stale, False))
+
+    def set_negative(self, key: Hashable):
+        """Remember that a lookup failed so it isn't retried on every request."""
+        now = time.monotonic()
+        self._store(key, _Entry(None, now + self.negative_expiry, 0.0, True))
+
+    def delete(self, key: Hashable):
+        self.data.pop(key, None)
+
+    def _store(self, key: Hashable, entry: _Entry):
+        self.data[key] = entry
+        self.data.move_to_end(key)
+        while len(self.data) > self.max_entries:
+            self.data.popitem(last=False)
+            self.counters["evictions"] += 1
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value for `key`, loading it with `loader` if needed.
+
+        The loader returns None to signal failure, which is negatively cached.
+        Stale entries are returned immediately while one background refresh
+        runs; concurrent misses for the same key share a single load.
+        """
+        state, value = self.lookup(key)
+        if state == FRESH:
+            self.counters["hits"] += 1
+            return value
+        if state == NEGATIVE:
+            self.counters["negative_hits"] += 1
+            return None
+        if state == STALE:
+            self.counters["stale_hits"] += 1
+            if key not in self._refreshing:
+                task = asyncio.create_task(self._load(key, loader, keep_stale=True))
+                self._refreshing[key] = task
+                task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+            return value
+
+        self.counters["misses"] += 1
+        pending = self._loading.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.ensure_future(self._load(key, loader))
+        self._loading[key] = future
+        future.add_done_callback(lambda _: self._loading.pop(key, None))
+        return await asyncio.shield(future)
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]], keep_stale: bool = False) -> Any:
+        try:
+            value = await loader()
+        except Exception as e:
+            logger.error(f"Error loading cache entry {key!r}: {e}")
+            value = None
+
+        if value is None:
+            self.counters["load_failures"] += 1
+            # A failed background refresh keeps serving the stale value
+            if not keep_stale:
+                self.set_negative(key)
+            return None
+
+        self.set(key, value)
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.counters["hits"] + self.counters["stale_hits"] + self.counters["misses"]
+        return {
+            "entries": len(self.data),
+            "max_entries": self.max_entries,
+            "hits": self.counters["hits"],
+            "stale_hits": self.counters["stale_hits"],
+            "negative_hits": self.counters["negative_hits"],
+            "misses": self.counters["misses"],
+            "evictions": self.counters["evictions"],
+            "expirations": self.counters["expirations"],
+            "load_failures": self.counters["load_failures"],
+            "hit_ratio": round((self.counters["hits"] + self.counters["stale_hits"]) / lookups, 4) if lookups else 0.0,
+        }
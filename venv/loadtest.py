@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+# Solana Address Scanner - Load test harness
+# Drives a running app with the /api/account/{address}, /api/accounts and
+# /ws get_account flows and reports latency percentiles, wallets per
+# second and RPC calls per wallet (read from mock_rpc.py's /stats).
+#
+# Typical run, against a fresh app pointed at the mock node:
+#   python mock_rpc.py --port 8899 --wallets 200 --tokens 20 --latency 50 --jitter 20
+#   SOLANA_RPC_URL=http://127.0.0.1:8899 PUBSUB_ENABLED=0 python app.py
+#   python loadtest.py --app http://127.0.0.1:8000 --rpc http://127.0.0.1:8899
+#
+# The ws scenario waits for each wallet's "complete" loading stage, so on a
+# fresh app it measures full refreshes; wallets the app already holds
+# complete data for are answered straight from its snapshot.
+
+import argparse
+import asyncio
+import json
+import math
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+import websockets
+
+SCENARIOS = ("account", "ws", "accounts")
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+class ScenarioResult:
+    def __init__(self, name: str):
+        self.name = name
+        self.latencies: List[float] = []
+        self.errors = 0
+        self.wallets = 0
+        self.elapsed = 0.0
+        self.rpc_calls: Optional[int] = None
+
+    def summary(self) -> Dict[str, Any]:
+        def ms(value):
+            return round(value * 1000, 1) if value is not None else None
+        return {
+            "scenario": self.name,
+            "requests": len(self.latencies) + self.errors,
+            "errors": self.errors,
+            "p50_ms": ms(percentile(self.latencies, 50)),
+            "p95_ms": ms(percentile(self.latencies, 95)),
+            "p99_ms": ms(percentile(self.latencies, 99)),
+            "wallets_per_second": round(self.wallets / self.elapsed, 2) if self.elapsed else 0.0,
+            "rpc_calls_per_wallet": (round(self.rpc_calls / self.wallets, 2)
+                                     if self.rpc_calls is not None and self.wallets else None),
+            "elapsed_seconds": round(self.elapsed, 3)
+        }
+
+
+class LoadTest:
+    def __init__(self, app_url: str, rpc_url: Optional[str], concurrency: int, timeout: float):
+        self.app_url = app_url.rstrip("/")
+        self.rpc_url = rpc_url.rstrip("/") if rpc_url else None
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.http = httpx.AsyncClient(timeout=timeout, limits=httpx.Limits(max_connections=concurrency * 2))
+
+    async def close(self):
+        await self.http.aclose()
+
+    async def wallets(self, count: int) -> List[str]:
+        response = await self.http.get(f"{self.rpc_url}/wallets")
+        response.raise_for_status()
+        return response.json()[:count]
+
+    async def rpc_calls(self, reset: bool = False) -> Optional[int]:
+        """Calls served by the mock node (None if --rpc isn't a mock_rpc.py server)."""
+        if not self.rpc_url:
+            return None
+        try:
+            response = await self.http.request("POST" if reset else "GET",
+                                               f"{self.rpc_url}/stats/reset" if reset else f"{self.rpc_url}/stats")
+            return response.json()["rpc_calls"]
+        except (httpx.HTTPError, ValueError, KeyError):
+            return None
+
+    async def wait_for_idle(self, poll: float = 0.1):
+        """Wait until the app's background task queue has nothing queued or running."""
+        deadline = time.monotonic() + self.timeout
+        while time.monotonic() < deadline:
+            try:
+                response = await self.http.get(f"{self.app_url}/api/cluster/status")
+                tasks = response.json()["tasks"]
+                if tasks["queued"] == 0 and tasks["running"] == 0:
+                    return
+            except (httpx.HTTPError, ValueError, KeyError):
+                return  # No task queue status to wait on
+            await asyncio.sleep(poll)
+
+    async def _run(self, result: ScenarioResult, jobs: List[Any], worker):
+        queue: asyncio.Queue = asyncio.Queue()
+        for job in jobs:
+            queue.put_nowait(job)
+        await self.rpc_calls(reset=True)
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(queue, result) for _ in range(min(self.concurrency, len(jobs)) or 1)))
+        result.elapsed = time.perf_counter() - started
+        # Let the background refreshes the requests queued land before counting RPC calls
+        await self.wait_for_idle()
+        result.rpc_calls = await self.rpc_calls()
+        return result
+
+    async def account(self, wallets: List[str]) -> ScenarioResult:
+        """GET /api/account/{address} once per wallet."""
+        async def worker(queue: asyncio.Queue, result: ScenarioResult):
+            while not queue.empty():
+                address = queue.get_nowait()
+                started = time.perf_counter()
+                try:
+                    response = await self.http.get(f"{self.app_url}/api/account/{address}")
+                    if response.status_code != 200:
+                        raise httpx.HTTPStatusError("bad status", request=response.request, response=response)
+                    result.latencies.append(time.perf_counter() - started)
+                    result.wallets += 1
+                except httpx.HTTPError:
+                    result.errors += 1
+        return await self._run(ScenarioResult("account"), wallets, worker)
+
+    async def accounts(self, requests: int) -> ScenarioResult:
+        """GET /api/accounts repeatedly; wallets/s counts the accounts returned."""
+        async def worker(queue: asyncio.Queue, result: ScenarioResult):
+            while not queue.empty():
+                queue.get_nowait()
+                started = time.perf_counter()
+                try:
+                    response = await self.http.get(f"{self.app_url}/api/accounts")
+                    response.raise_for_status()
+                    accounts = len(response.json()["accounts"])
+                    result.latencies.append(time.perf_counter() - started)
+                    result.wallets += accounts
+                except (httpx.HTTPError, ValueError, KeyError):
+                    result.errors += 1
+        result = await self._run(ScenarioResult("accounts"), list(range(requests)), worker)
+        # RPC calls per wallet are meaningless for reads of already stored data
+        result.rpc_calls = None
+        return result
+
+    async def ws(self, wallets: List[str]) -> ScenarioResult:
+        """One WebSocket per worker; get_account per wallet, timed until its data is complete."""
+        ws_url = self.app_url.replace("http://", "ws://").replace("https://", "wss://") + "/ws"
+
+        async def wait_complete(websocket, address: str, records: Dict[str, dict]):
+            while True:
+                message = json.loads(await asyncio.wait_for(websocket.recv(), self.timeout))
+                kind = message.get("type")
+                if kind == "full_update":
+                    for record in message["data"]:
+                        records[record["address"]] = record
+                elif kind == "account_update":
+                    records[message["data"]["address"]] = message["data"]
+                elif kind == "account_delta":
+                    record = records.setdefault(message["address"], {})
+                    record.update(message["changes"])
+                    for key in message.get("removed", []):
+                        record.pop(key, None)
+                elif kind == "account_error" and message.get("address") == address:
+                    raise RuntimeError(message.get("message"))
+                if records.get(address, {}).get("loadingStage") == "complete":
+                    return
+
+        async def worker(queue: asyncio.Queue, result: ScenarioResult):
+            async with websockets.connect(ws_url, max_size=None) as websocket:
+                records: Dict[str, dict] = {}
+                while not queue.empty():
+                    address = queue.get_nowait()
+                    started = time.perf_counter()
+                    try:
+                        await websocket.send(json.dumps({"type": "get_account", "address": address}))
+                        await wait_complete(websocket, address, records)
+                        result.latencies.append(time.perf_counter() - started)
+                        result.wallets += 1
+                    except (RuntimeError, asyncio.TimeoutError):
+                        result.errors += 1
+                    # Keep this connection's traffic to the wallet being measured
+                    await websocket.send(json.dumps({"type": "unsubscribe", "addresses": [address]}))
+        return await self._run(ScenarioResult("ws"), wallets, worker)
+
+
+def print_table(summaries: List[Dict[str, Any]]):
+    columns = ["scenario", "requests", "errors", "p50_ms", "p95_ms", "p99_ms",
+               "wallets_per_second", "rpc_calls_per_wallet"]
+    rows = [[str(s[c]) if s[c] is not None else "-" for c in columns] for s in summaries]
+    widths = [max(len(c), *(len(r[i]) for r in rows)) for i, c in enumerate(columns)]
+    print("  ".join(c.ljust(w) for c, w in zip(columns, widths)))
+    for row in rows:
+        print("  ".join(v.ljust(w) for v, w in zip(row, widths)))
+
+
+async def run(args) -> List[Dict[str, Any]]:
+    test = LoadTest(args.app, args.rpc, args.concurrency, args.timeout)
+    try:
+        scenarios = SCENARIOS if args.scenario == "all" else (args.scenario,)
+        wallets = args.address or await test.wallets(args.wallets * len(scenarios))
+        # Give each scenario its own wallets where there are enough, so one
+        # scenario doesn't measure data an earlier one already loaded
+        slices = {
+            scenario: wallets[i * args.wallets:(i + 1) * args.wallets] or wallets[:args.wallets]
+            for i, scenario in enumerate(scenarios)
+        } if not args.address else {scenario: wallets for scenario in scenarios}
+        summaries = []
+        for scenario in scenarios:
+            if scenario == "account":
+                result = await test.account(slices[scenario])
+            elif scenario == "ws":
+                result = await test.ws(slices[scenario])
+            else:
+                result = await test.accounts(args.requests)
+            summaries.append(result.summary())
+        return summaries
+    finally:
+        await test.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the scanner's REST and WebSocket endpoints")
+    parser.add_argument("--app", default="http://127.0.0.1:8000", help="base URL of the running app")
+    parser.add_argument("--rpc", default="http://127.0.0.1:8899",
+                        help="mock_rpc.py server, for the wallet list and RPC call counts")
+    parser.add_argument("--scenario", choices=SCENARIOS + ("all",), default="all")
+    parser.add_argument("--wallets", type=int, default=50, help="wallets to request")
+    parser.add_argument("--address", action="append", help="explicit wallet address (repeatable)")
+    parser.add_argument("--requests", type=int, default=200, help="requests for the accounts scenario")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    summaries = asyncio.run(run(args))
+    if args.json:
+        json.dump(summaries, sys.stdout, indent=2)
+        print()
+    else:
+        print_table(summaries)
+
+
+if __name__ == "__main__":
+    main()
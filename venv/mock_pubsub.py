@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# Solana Address Scanner - Stand-in PubSub server
+# Minimal local replacement for a node's WebSocket endpoint, for exercising
+# the subscription engine without mainnet. Supports accountSubscribe and
+# owner-filtered programSubscribe, plus control methods to push changes:
+#
+#   mock_setLamports      [address, lamports]
+#   mock_setTokenAccount  [owner, pubkey, mint, amount, decimals]
+#   mock_dropConnections  []
+#   mock_failSubscribes   [count]  (reject the next `count` subscribe requests)
+#
+# Run with: python mock_pubsub.py --port 8900
+# and point the app at it with SOLANA_WS_URL=ws://127.0.0.1:8900
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import websockets
+
+from pubsub import TOKEN_PROGRAM_ID, TOKEN_OWNER_OFFSET
+
+logger = logging.getLogger("solana_scanner")
+
+
+def _owner_filter(params: List[Any]) -> Optional[str]:
+    for item in (params[1] if len(params) > 1 else {}).get("filters", []):
+        memcmp = item.get("memcmp")
+        if memcmp and memcmp.get("offset") == TOKEN_OWNER_OFFSET:
+            return memcmp.get("bytes")
+    return None
+
+
+class MockPubSubServer:
+    """Serves Solana-style PubSub subscriptions and lets callers push changes."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8900):
+        self.host = host
+        self.port = port
+        self.slot = 1
+        self.ids = itertools.count(1)
+        # subscription id -> (websocket, kind, address)
+        self.subscriptions: Dict[int, Tuple[Any, str, str]] = {}
+        self.connections = set()
+        self.requests = 0
+        self.failing_subscribes = 0
+        self._server = None
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}"
+
+    async def start(self):
+        self._server = await websockets.serve(self._handler, self.host, self.port)
+        return self
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def _account(self, lamports: int, data: Any = None, owner: str = "11111111111111111111111111111111") -> dict:
+        return {
+            "lamports": lamports,
+            "data": data if data is not None else ["", "base64"],
+            "owner": owner,
+            "executable": False,
+            "rentEpoch": 0,
+            "space": 0
+        }
+
+    async def _notify(self, kind: str, address: str, method: str, value: Any) -> int:
+        self.slot += 1
+        sent = 0
+        for subscription, (websocket, sub_kind, sub_address) in list(self.subscriptions.items()):
+            if sub_kind != kind or sub_address != address:
+                continue
+            message = {
+                "jsonrpc": "2.0",
+                "method": method,
+                "params": {"result": {"context": {"slot": self.slot}, "value": value}, "subscription": subscription}
+            }
+            try:
+                await websocket.send(json.dumps(message))
+                sent += 1
+            except websockets.ConnectionClosed:
+                pass
+        return sent
+
+    async def set_lamports(self, address: str, lamports: int) -> int:
+        """Push an accountNotification to everyone subscribed to the address."""
+        return await self._notify("account", address, "accountNotification", self._account(lamports))
+
+    async def set_token_account(self, owner: str, pubkey: str, mint: str, amount: int, decimals: int = 6) -> int:
+        """Push a programNotification for a token account owned by `owner`."""
+        data = {
+            "program": "spl-token",
+            "parsed": {
+                "type": "account",
+                "info": {
+                    "mint": mint,
+                    "owner": owner,
+                    "state": "initialized",
+                    "isNative": False,
+                    "tokenAmount": {
+                        "amount": str(amount),
+                        "decimals": decimals,
+                        "uiAmount": amount / (10 ** decimals),
+                        "uiAmountString": str(amount / (10 ** decimals))
+                    }
+                }
+            },
+            "space": 165
+        }
+        value = {"pubkey": pubkey, "account": self._account(2039280, data, TOKEN_PROGRAM_ID)}
+        return await self._notify("token", owner, "programNotification", value)
+
+    async def drop_connections(self):
+        """Close every client connection, e.g. to exercise resubscription."""
+        for websocket in list(self.connections):
+            await websocket.close()
+
+    async def _handle_request(self, websocket, request: dict) -> Any:
+        method, params = request.get("method"), request.get("params") or []
+        if method in ("accountSubscribe", "programSubscribe") and self.failing_subscribes:
+            self.failing_subscribes -= 1
+            raise ValueError("subscription rejected")
+        if method == "accountSubscribe":
+            subscription = next(self.ids)
+            self.subscriptions[subscription] = (websocket, "account", params[0])
+            return subscription
+        if method == "programSubscribe":
+            owner = _owner_filter(params)
+            if params[0] != TOKEN_PROGRAM_ID or owner is None:
+                raise ValueError("only owner-filtered token program subscriptions are supported")
+            subscription = next(self.ids)
+            self.subscriptions[subscription] = (websocket, "token", owner)
+            return subscription
+        if method in ("accountUnsubscribe", "programUnsubscribe"):
+            return self.subscriptions.pop(params[0], None) is not None
+        if method == "mock_setLamports":
+            return await self.set_lamports(params[0], int(params[1]))
+        if method == "mock_setTokenAccount":
+            return await self.set_token_account(*params)
+        if method == "mock_dropConnections":
+            asyncio.get_running_loop().call_soon(lambda: asyncio.ensure_future(self.drop_connections()))
+            return True
+        if method == "mock_failSubscribes":
+            self.failing_subscribes = int(params[0])
+            return True
+        raise ValueError(f"Method not found: {method}")
+
+    async def _handler(self, websocket, path=None):
+        self.connections.add(websocket)
+        try:
+            async for raw in websocket:
+                request = json.loads(raw)
+                self.requests += 1
+                try:
+                    response = {"jsonrpc": "2.0", "id": request.get("id"),
+                                "result": await self._handle_request(websocket, request)}
+                except Exception as e:
+                    response = {"jsonrpc": "2.0", "id": request.get("id"),
+                                "error": {"code": -32601, "message": str(e)}}
+                await websocket.send(json.dumps(response))
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            self.connections.discard(websocket)
+            for subscription, (owner, _, _) in list(self.subscriptions.items()):
+                if owner is websocket:
+                    del self.subscriptions[subscription]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a stand-in Solana PubSub server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    async def run():
+        server = await MockPubSubServer(args.host, args.port).start()
+        logger.info(f"Mock PubSub server listening on {server.url}")
+        await asyncio.Future()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+# Solana Address Scanner - Mock JSON-RPC server
+# Local stand-in for a Solana RPC node for benchmarks: synthetic wallets
+# with N token accounts each, configurable latency and jitter, and injected
+# 429 responses. Single and batched JSON-RPC requests are supported.
+#
+#   GET  /wallets      synthetic wallet addresses
+#   GET  /stats        request counts per method (batch entries counted individually)
+#   POST /stats/reset  zero the counters
+#
+# Run with: python mock_rpc.py --port 8899 --wallets 100 --tokens 20 --latency 50 --rate-429 0.02
+# and point the app at it with SOLANA_RPC_URL=http://127.0.0.1:8899
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+import base58
+from aiohttp import web
+
+from pubsub import TOKEN_PROGRAM_ID
+
+logger = logging.getLogger("solana_scanner")
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SNAPSHOT_PATH = os.path.join(BASE_DIR, "token_registry_snapshot.json")
+
+
+def synthetic_address(label: str) -> str:
+    """Deterministic, valid-looking 32 byte public key for a label."""
+    return base58.b58encode(hashlib.sha256(label.encode()).digest()).decode()
+
+
+def _known_mints() -> List[str]:
+    # Use real mints where we can so metadata and prices resolve like they would on mainnet
+    try:
+        with open(SNAPSHOT_PATH, encoding="utf-8") as f:
+            return [row[0] for row in json.load(f)["tokens"]]
+    except (OSError, ValueError, KeyError):
+        return []
+
+
+class SyntheticWallet:
+    def __init__(self, index: int, tokens: int, signatures: int, mints: List[str]):
+        self.address = synthetic_address(f"wallet-{index}")
+        self.lamports = (index + 1) * 123_456_789
+        now = int(time.time())
+        self.token_accounts = []
+        for i in range(tokens):
+            mint = mints[i] if i < len(mints) else synthetic_address(f"mint-{i}")
+            decimals = 6
+            amount = (index + 1) * (i + 1) * 1_000_000
+            self.token_accounts.append({
+                "pubkey": synthetic_address(f"token-account-{index}-{i}"),
+                "account": {
+                    "lamports": 2039280,
+                    "owner": TOKEN_PROGRAM_ID,
+                    "executable": False,
+                    "rentEpoch": 0,
+                    "space": 165,
+                    "data": {
+                        "program": "spl-token",
+                        "space": 165,
+                        "parsed": {
+                            "type": "account",
+                            "info": {
+                                "mint": mint,
+                                "owner": self.address,
+                                "state": "initialized",
+                                "isNative": False,
+                                "tokenAmount": {
+                                    "amount": str(amount),
+                                    "decimals": decimals,
+                                    "uiAmount": amount / 10 ** decimals,
+                                    "uiAmountString": str(amount / 10 ** decimals)
+                                }
+                            }
+                        }
+                    }
+                }
+            })
+        self.signatures = [
+            {
+                "signature": synthetic_address(f"signature-{index}-{i}"),
+                "slot": 300_000_000 - i * 1000,
+                "blockTime": now - i * 3600,
+                "err": None,
+                "memo": None,
+                "confirmationStatus": "finalized"
+            }
+            for i in range(signatures)
+        ]
+
+
+class MockRpcServer:
+    """aiohttp JSON-RPC server answering from synthetic wallets."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8899, wallets: int = 100, tokens: int = 10,
+                 signatures: int = 50, latency: float = 0.0, jitter: float = 0.0, rate_429: float = 0.0,
+                 retry_after: Optional[float] = None, seed: Optional[int] = None):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_429 = rate_429
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        mints = _known_mints()
+        self.wallets = [SyntheticWallet(i, tokens, signatures, mints) for i in range(wallets)]
+        self.by_address: Dict[str, SyntheticWallet] = {w.address: w for w in self.wallets}
+        self.counters = Counter()
+        self._runner: Optional[web.AppRunner] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self):
+        app = web.Application(client_max_size=16 * 1024 * 1024)
+        app.router.add_post("/", self._handle_rpc)
+        app.router.add_get("/wallets", self._handle_wallets)
+        app.router.add_get("/stats", self._handle_stats)
+        app.router.add_post("/stats/reset", self._handle_reset)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        return self
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def stats(self) -> Dict[str, Any]:
+        methods = {key[len("method:"):]: n for key, n in self.counters.items() if key.startswith("method:")}
+        return {
+            "http_requests": self.counters["http_requests"],
+            "rpc_calls": sum(methods.values()),
+            "rate_limited": self.counters["rate_limited"],
+            "methods": methods
+        }
+
+    def _result(self, method: str, params: List[Any]) -> Any:
+        context = {"slot": 300_000_000}
+        if method == "getBalance":
+            wallet = self.by_address.get(params[0])
+            return {"context": context, "value": wallet.lamports if wallet else 0}
+        if method in ("getMultipleAccounts", "getAccountInfo"):
+            addresses = params[0] if method == "getMultipleAccounts" else [params[0]]
+            accounts = []
+            for address in addresses:
+                wallet = self.by_address.get(address)
+                accounts.append({
+                    "lamports": wallet.lamports, "data": ["", "base64"], "owner": "11111111111111111111111111111111",
+                    "executable": False, "rentEpoch": 0, "space": 0
+                } if wallet else None)
+            return {"context": context, "value": accounts if method == "getMultipleAccounts" else accounts[0]}
+        if method == "getTokenAccountsByOwner":
+            wallet = self.by_address.get(params[0])
+            return {"context": context, "value": wallet.token_accounts if wallet else []}
+        if method == "getSignaturesForAddress":
+            wallet = self.by_address.get(params[0])
+            options = params[1] if len(params) > 1 else {}
+            signatures = wallet.signatures if wallet else []
+            names = [s["signature"] for s in signatures]
+            if options.get("before") in names:
+                signatures = signatures[names.index(options["before"]) + 1:]
+                names = names[names.index(options["before"]) + 1:]
+            if options.get("until") in names:
+                signatures = signatures[:names.index(options["until"])]
+            return signatures[:options.get("limit", 1000)]
+        if method == "getAssetsByOwner":
+            return {"total": 0, "limit": 0, "page": 1, "items": []}
+        raise KeyError(method)
+
+    def _answer(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        method = request.get("method")
+        self.counters[f"method:{method}"] += 1
+        try:
+            result = self._result(method, request.get("params") or [])
+            return {"jsonrpc": "2.0", "id": request.get("id"), "result": result}
+        except KeyError:
+            return {"jsonrpc": "2.0", "id": request.get("id"),
+                    "error": {"code": -32601, "message": f"Method not found: {method}"}}
+        except (IndexError, TypeError, ValueError) as e:
+            return {"jsonrpc": "2.0", "id": request.get("id"), "error": {"code": -32602, "message": str(e)}}
+
+    async def _handle_rpc(self, request: web.Request) -> web.Response:
+        self.counters["http_requests"] += 1
+        delay = self.latency + self.random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if self.rate_429 and self.random.random() < self.rate_429:
+            self.counters["rate_limited"] += 1
+            headers = {"Retry-After": str(self.retry_after)} if self.retry_after is not None else None
+            return web.Response(status=429, text="Too many requests", headers=headers)
+
+        body = await request.json()
+        if isinstance(body, list):
+            return web.json_response([self._answer(item) for item in body])
+        return web.json_response(self._answer(body))
+
+    async def _handle_wallets(self, request: web.Request) -> web.Response:
+        return web.json_response([wallet.address for wallet in self.wallets])
+
+    async def _handle_stats(self, request: web.Request) -> web.Response:
+        return web.json_response(self.stats())
+
+    async def _handle_reset(self, request: web.Request) -> web.Response:
+        self.counters.clear()
+        return web.json_response(self.stats())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a mock Solana JSON-RPC server with synthetic wallets")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8899)
+    parser.add_argument("--wallets", type=int, default=100, help="number of synthetic wallets")
+    parser.add_argument("--tokens", type=int, default=10, help="token accounts per wallet")
+    parser.add_argument("--signatures", type=int, default=50, help="signatures per wallet")
+    parser.add_argument("--latency", type=float, default=0.0, help="added latency per request (ms)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="+/- random latency per request (ms)")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="share of requests answered with 429 (0-1)")
+    parser.add_argument("--retry-after", type=float, default=None, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--pubsub-port", type=int, default=None, help="also run the stand-in PubSub server")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    async def run():
+        server = await MockRpcServer(
+            args.host, args.port, wallets=args.wallets, tokens=args.tokens, signatures=args.signatures,
+            latency=args.latency / 1000, jitter=args.jitter / 1000, rate_429=args.rate_429,
+            retry_after=args.retry_after, seed=args.seed
+        ).start()
+        logger.info(f"Mock RPC server listening on {server.url} with {len(server.wallets)} wallets")
+        if args.pubsub_port:
+            from mock_pubsub import MockPubSubServer
+            pubsub = await MockPubSubServer(args.host, args.pubsub_port).start()
+            logger.info(f"Mock PubSub server listening on {pubsub.url}")
+        await asyncio.Future()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+# Solana Address Scanner - PubSub subscription engine
+# Pushes account changes from the RPC node's WebSocket endpoint instead of
+# polling: accountSubscribe per wallet plus an owner-filtered programSubscribe
+# for its SPL token accounts, multiplexed over a small pool of connections
+# and resubscribed automatically after a reconnect or a failed subscribe
+
+import asyncio
+import itertools
+import json
+import logging
+import random
+import zlib
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import websockets
+
+logger = logging.getLogger("solana_scanner")
+
+TOKEN_PROGRAM_ID = "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"
+
+# SPL token accounts are 165 bytes with the owner at offset 32
+TOKEN_ACCOUNT_SIZE = 165
+TOKEN_OWNER_OFFSET = 32
+
+UNSUBSCRIBE_METHODS = {
+    "accountSubscribe": "accountUnsubscribe",
+    "programSubscribe": "programUnsubscribe",
+}
+
+# (kind, address) - kind is "account" or "token"
+SubscriptionKey = Tuple[str, str]
+
+
+def websocket_url(rpc_url: str) -> str:
+    """Derive the PubSub endpoint from an HTTP RPC URL (same host, ws/wss scheme)."""
+    if rpc_url.startswith("https://"):
+        return "wss://" + rpc_url[len("https://"):]
+    if rpc_url.startswith("http://"):
+        return "ws://" + rpc_url[len("http://"):]
+    return rpc_url
+
+
+class _PubSubConnection:
+    """One pooled WebSocket connection carrying many subscriptions."""
+
+    def __init__(self, engine: "SubscriptionEngine", index: int):
+        self.engine = engine
+        self.index = index
+        self.keys: Set[SubscriptionKey] = set()  # Subscriptions this connection should hold
+        self.active: Dict[SubscriptionKey, int] = {}  # key -> server subscription id
+        self.by_id: Dict[int, SubscriptionKey] = {}
+        self.pending: Dict[int, Tuple[asyncio.Future, Optional[SubscriptionKey]]] = {}
+        self.ids = itertools.count(1)
+        self.ws = None
+        self.task: Optional[asyncio.Task] = None
+
+    def add(self, key: SubscriptionKey):
+        self.keys.add(key)
+        if self.ws is not None:
+            self.engine.spawn(self._subscribe(key))
+
+    def remove(self, key: SubscriptionKey):
+        self.keys.discard(key)
+        if self.ws is not None and key in self.active:
+            self.engine.spawn(self._unsubscribe(key))
+
+    async def _send(self, method: str, params: Any, key: Optional[SubscriptionKey] = None) -> Any:
+        request_id = next(self.ids)
+        future = asyncio.get_running_loop().create_future()
+        self.pending[request_id] = (future, key)
+        try:
+            await self.ws.send(json.dumps({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}))
+            return await asyncio.wait_for(future, self.engine.request_timeout)
+        finally:
+            self.pending.pop(request_id, None)
+
+    async def _subscribe(self, key: SubscriptionKey, retry_delay: Optional[float] = None):
+        if key in self.active or any(pending_key == key for _, pending_key in self.pending.values()):
+            return
+        ws = self.ws
+        method, params = self.engine.subscription_request(key)
+        try:
+            await self._send(method, params, key)
+        except Exception as e:
+            # The safety-net sweep covers the gap until the retry succeeds
+            delay = retry_delay or self.engine.reconnect_delay
+            self.engine.stats["subscribe_errors"] += 1
+            logger.error(f"Error subscribing to {key[0]} changes for {key[1]}, retrying in {delay:.1f}s: {e}")
+            self.engine.spawn(self._retry_subscribe(key, ws, delay))
+
+    async def _retry_subscribe(self, key: SubscriptionKey, ws, delay: float):
+        # Jittered exponential backoff, like reconnects; a reconnect in the
+        # meantime resubscribes everything itself
+        await asyncio.sleep(random.uniform(delay / 2, delay))
+        if self.ws is ws and key in self.keys:
+            await self._subscribe(key, min(delay * 2, self.engine.max_reconnect_delay))
+
+    async def _unsubscribe(self, key: SubscriptionKey):
+        subscription = self.active.pop(key, None)
+        if subscription is None:
+            return
+        self.by_id.pop(subscription, None)
+        method, _ = self.engine.subscription_request(key)
+        try:
+            await self._send(UNSUBSCRIBE_METHODS[method], [subscription])
+        except Exception as e:
+            logger.warning(f"Error unsubscribing from {key[0]} changes for {key[1]}: {e}")
+
+    def _handle(self, message: Dict[str, Any]):
+        if "id" in message:
+            future, key = self.pending.get(message["id"], (None, None))
+            if "error" in message:
+                if future and not future.done():
+                    future.set_exception(RuntimeError(message["error"].get("message", message["error"])))
+                return
+            if key is not None:
+                # Map the subscription here, before the next message is read,
+                # so a notification right behind the reply is not dropped
+                self.active[key] = message["result"]
+                self.by_id[message["result"]] = key
+                if key not in self.keys:
+                    # Untracked while the subscribe was in flight
+                    self.engine.spawn(self._unsubscribe(key))
+            if future and not future.done():
+                future.set_result(message.get("result"))
+            return
+
+        params = message.get("params") or {}
+        key = self.by_id.get(params.get("subscription"))
+        if key is None:
+            return
+        self.engine.stats["notifications"] += 1
+        kind, address = key
+        self.engine.notify(address, kind, (params.get("result") or {}).get("value"))
+
+    async def run(self):
+        delay = self.engine.reconnect_delay
+        first = True
+        while True:
+            try:
+                async with websockets.connect(self.engine.url, ping_interval=self.engine.ping_interval,
+                                              max_size=None) as ws:
+                    self.ws = ws
+                    delay = self.engine.reconnect_delay
+                    if not first:
+                        self.engine.stats["reconnects"] += 1
+                        logger.info(f"PubSub connection {self.index} re-established, "
+                                    f"resubscribing {len(self.keys)} subscriptions")
+                    for key in list(self.keys):
+                        self.engine.spawn(self._subscribe(key))
+                    if not first:
+                        # Anything that changed while we were disconnected was missed
+                        for address in sorted({address for _, address in self.keys}):
+                            self.engine.notify(address, "resync", None)
+                    first = False
+
+                    async for raw in ws:
+                        try:
+                            self._handle(json.loads(raw))
+                        except Exception as e:
+                            logger.error(f"Error handling PubSub message: {e}")
+                logger.warning(f"PubSub connection {self.index} closed by the server")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"PubSub connection {self.index} failed: {e}")
+            finally:
+                self.ws = None
+                self.active.clear()
+                self.by_id.clear()
+                for future, _ in self.pending.values():
+                    if not future.done():
+                        future.cancel()
+                self.pending.clear()
+
+            # Jittered exponential backoff between reconnect attempts
+            await asyncio.sleep(random.uniform(delay / 2, delay))
+            delay = min(delay * 2, self.engine.max_reconnect_delay)
+
+
+class SubscriptionEngine:
+    """Tracks wallets through PubSub subscriptions spread over a connection pool.
+
+    `on_change(address, kind, value)` is called for every notification, with
+    kind "account" (value is the account), "token" (value is {pubkey, account}
+    of one of its token accounts) or "resync" after a reconnect, when
+    notifications may have been missed.
+    """
+
+    def __init__(self, url: str, pool_size: int = 1, commitment: str = "confirmed",
+                 reconnect_delay: float = 1.0, max_reconnect_delay: float = 30.0,
+                 ping_interval: float = 20.0, request_timeout: float = 10.0):
+        self.url = url
+        self.commitment = commitment
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.ping_interval = ping_interval
+        self.request_timeout = request_timeout
+        self.tracked: Set[str] = set()
+        self.connections = [_PubSubConnection(self, i) for i in range(max(1, pool_size))]
+        self.on_change: Optional[Callable[[str, str, Any], None]] = None
+        self.stats = Counter()
+        self._tasks: Set[asyncio.Task] = set()
+
+    def subscription_request(self, key: SubscriptionKey) -> Tuple[str, List[Any]]:
+        kind, address = key
+        if kind == "account":
+            return "accountSubscribe", [address, {"encoding": "base64", "commitment": self.commitment}]
+        return "programSubscribe", [TOKEN_PROGRAM_ID, {
+            "encoding": "jsonParsed",
+            "commitment": self.commitment,
+            "filters": [
+                {"dataSize": TOKEN_ACCOUNT_SIZE},
+                {"memcmp": {"offset": TOKEN_OWNER_OFFSET, "bytes": address}}
+            ]
+        }]
+
+    def _connection(self, address: str) -> _PubSubConnection:
+        # Both of a wallet's subscriptions share a connection, so one resync covers it
+        return self.connections[zlib.crc32(address.encode()) % len(self.connections)]
+
+    def track(self, address: str):
+        """Start receiving changes for a wallet and its token accounts."""
+        if address in self.tracked:
+            return
+        self.tracked.add(address)
+        connection = self._connection(address)
+        connection.add(("account", address))
+        connection.add(("token", address))
+
+    def untrack(self, address: str):
+        if address not in self.tracked:
+            return
+        self.tracked.discard(address)
+        connection = self._connection(address)
+        connection.remove(("account", address))
+        connection.remove(("token", address))
+
+    def notify(self, address: str, kind: str, value: Any):
+        if self.on_change is None:
+            return
+        try:
+            self.on_change(address, kind, value)
+        except Exception as e:
+            logger.error(f"Error handling {kind} notification for {address}: {e}")
+
+    def spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def start(self, on_change: Callable[[str, str, Any], None]):
+        """Open the connection pool and subscribe everything tracked so far."""
+        self.on_change = on_change
+        for connection in self.connections:
+            if connection.task is None:
+                connection.task = asyncio.create_task(connection.run())
+        logger.info(f"PubSub engine started with {len(self.connections)} connection(s) to {self.url}")
+
+    async def stop(self):
+        tasks = [c.task for c in self.connections if c.task] + list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        # Let the connections close their sockets cleanly
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for connection in self.connections:
+            connection.task = None
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "tracked": len(self.tracked),
+            "connections": sum(1 for c in self.connections if c.ws is not None),
+            "pool_size": len(self.connections),
+            "subscriptions": sum(len(c.active) for c in self.connections),
+            "notifications": self.stats["notifications"],
+            "reconnects": self.stats["reconnects"],
+            "subscribe_errors": self.stats["subscribe_errors"],
+        }
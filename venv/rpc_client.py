@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# Solana Address Scanner - Async RPC client
+# Shared, connection-pooled HTTP client used for all Solana JSON-RPC and REST lookups
+
+import itertools
+import logging
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+# HTTP/2 is only available when the optional "h2" package is installed
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger("solana_scanner")
+
+# httpx logs every request at INFO, which would flood solana_scanner.log
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+class RpcError(Exception):
+    """Raised when an RPC call returns an error object or an unusable response."""
+
+    def __init__(self, method: str, error: Any, retry_after: Optional[float] = None):
+        self.method = method
+        self.error = error
+        self.code = error.get("code") if isinstance(error, dict) else None
+        self.retry_after = retry_after
+        super().__init__(f"{method} failed: {error}")
+
+    @property
+    def rate_limited(self) -> bool:
+        return self.code == 429
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class SolanaRpcClient:
+    """Async JSON-RPC client that keeps a single pooled HTTP connection set alive."""
+
+    def __init__(self, url: str, timeout: float = 10.0, max_connections: int = 100,
+                 max_keepalive_connections: int = 20):
+        self.url = url
+        self.timeout = timeout
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+        )
+        self._client: Optional[httpx.AsyncClient] = None
+        self._ids = itertools.count(1)
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # Created lazily so the pool is bound to the running event loop
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                limits=self.limits,
+                timeout=httpx.Timeout(self.timeout),
+            )
+        return self._client
+
+    @staticmethod
+    def _check_status(method: str, response: httpx.Response):
+        # Rate limiting and server errors may not carry a JSON-RPC body at all
+        if response.status_code == 429 or response.status_code >= 500:
+            raise RpcError(
+                method,
+                {"code": response.status_code, "message": response.text[:200]},
+                retry_after=parse_retry_after(response.headers.get("Retry-After")),
+            )
+
+    def _payload(self, method: str, params: Any) -> Dict[str, Any]:
+        return {
+            "jsonrpc": "2.0",
+            "id": next(self._ids),
+            "method": method,
+            "params": params if params is not None else [],
+        }
+
+    async def call(self, method: str, params: Any = None, timeout: Optional[float] = None) -> Any:
+        """Perform a single JSON-RPC call and return its "result" member."""
+        response = await self._get_client().post(
+            self.url,
+            json=self._payload(method, params),
+            timeout=timeout if timeout is not None else self.timeout,
+        )
+        self._check_status(method, response)
+        try:
+            body = response.json()
+        except ValueError:
+            raise RpcError(method, {"code": response.status_code, "message": response.text[:200]})
+
+        if "error" in body:
+            raise RpcError(method, body["error"],
+                           retry_after=parse_retry_after(response.headers.get("Retry-After")))
+        if "result" not in body:
+            raise RpcError(method, {"message": f"Unexpected response format: {body}"})
+        return body["result"]
+
+    async def call_batch(self, calls: List[Tuple[str, Any]], timeout: Optional[float] = None) -> List[Any]:
+        """Send several calls as one JSON-RPC batch request.
+
+        Results come back in the same order as ``calls``; a failed entry is
+        returned as an ``RpcError`` instance instead of raising, so one bad
+        address does not sink the rest of the batch.
+        """
+        if not calls:
+            return []
+
+        payloads = [self._payload(method, params) for method, params in calls]
+        response = await self._get_client().post(
+            self.url,
+            json=payloads,
+            timeout=timeout if timeout is not None else self.timeout,
+        )
+        self._check_status("batch", response)
+        try:
+            body = response.json()
+        except ValueError:
+            raise RpcError("batch", {"code": response.status_code, "message": response.text[:200]})
+
+        # Some providers reject the whole batch with a single error object
+        if isinstance(body, dict):
+            raise RpcError("batch", body.get("error", body),
+                           retry_after=parse_retry_after(response.headers.get("Retry-After")))
+
+        by_id = {item.get("id"): item for item in body if isinstance(item, dict)}
+        results = []
+        for (method, _), payload in zip(calls, payloads):
+            item = by_id.get(payload["id"])
+            if item is None:
+                results.append(RpcError(method, {"message": "Missing response in batch"}))
+            elif "error" in item:
+                results.append(RpcError(method, item["error"]))
+            else:
+                results.append(item.get("result"))
+        return results
+
+    async def get_json(self, url: str, params: Optional[Dict[str, Any]] = None,
+                       timeout: Optional[float] = None) -> Any:
+        """GET a JSON document (token lists, price APIs) over the shared pool."""
+        response = await self._get_client().get(
+            url,
+            params=params,
+            timeout=timeout if timeout is not None else self.timeout,
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def get_if_changed(self, url: str, validators: Optional[Dict[str, str]] = None,
+                             timeout: Optional[float] = None) -> Tuple[Optional[bytes], Dict[str, str]]:
+        """Conditional GET using ETag / Last-Modified validators from a previous fetch.
+
+        Returns (None, validators) when the document hasn't changed, otherwise
+        (raw body, new validators); large documents can then be parsed off the
+        event loop.
+        """
+        validators = validators or {}
+        headers = {}
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+
+        response = await self._get_client().get(
+            url,
+            headers=headers,
+            timeout=timeout if timeout is not None else self.timeout,
+        )
+        if response.status_code == 304:
+            return None, validators
+        response.raise_for_status()
+
+        new_validators = {}
+        if response.headers.get("ETag"):
+            new_validators["etag"] = response.headers["ETag"]
+        if response.headers.get("Last-Modified"):
+            new_validators["last_modified"] = response.headers["Last-Modified"]
+        return response.content, new_validators
+
+    async def close(self):
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+# Solana Address Scanner - RPC scheduler
+# Rate-limit-aware front end for the RPC client: per-method token buckets,
+# priority lanes, jittered exponential backoff and single-flight coalescing
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import json
+import logging
+import random
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from metrics import HistogramFamily
+from rpc_client import RpcError, SolanaRpcClient
+
+logger = logging.getLogger("solana_scanner")
+
+# Priority lanes - lower values are served first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 10
+
+# Priority for RPC calls made from the current task. Tasks inherit it from
+# whoever created them, so setting it once at the top of a request handler
+# or background loop covers every lookup made underneath.
+rpc_priority = contextvars.ContextVar("rpc_priority", default=PRIORITY_INTERACTIVE)
+
+# JSON-RPC error codes worth retrying besides HTTP 429/5xx
+RETRYABLE_CODES = {429, 500, 502, 503, 504, -32005}
+
+
+def is_retryable(error: Exception) -> bool:
+    """Check whether an RPC failure is transient and worth retrying."""
+    if isinstance(error, RpcError):
+        return error.code in RETRYABLE_CODES
+    return isinstance(error, httpx.TransportError)
+
+
+class TokenBucket:
+    """Async token bucket that grants tokens to waiters in priority order.
+
+    A cost above the bucket's capacity (e.g. a large batch) is granted once
+    the bucket is full and leaves it in debt, so the whole cost is still
+    paid for before anything else is granted.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.capacity = burst if burst is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._waiters: List[Tuple[int, int, asyncio.Future, float]] = []
+        self._seq = itertools.count()
+        self._pump_task: Optional[asyncio.Task] = None
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def set_rate(self, rate: float):
+        """Change the refill rate, keeping what has been earned so far at the old rate."""
+        self._refill()
+        self.rate = rate
+        self.capacity = max(1.0, rate)
+        self.tokens = min(self.tokens, self.capacity)
+
+    def pause(self, seconds: float):
+        """Stop granting tokens for a while, e.g. after the provider sent Retry-After."""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+        # Whatever we had banked was evidently more than the provider allows
+        self.tokens = min(self.tokens, 0.0)
+
+    async def acquire(self, priority: int = PRIORITY_INTERACTIVE, cost: float = 1.0,
+                      ticket: Optional[asyncio.Future] = None):
+        """Wait for `cost` tokens. Pass a future as `ticket` to be able to promote the wait later."""
+        self._refill()
+        if not self._waiters and time.monotonic() >= self.paused_until and self.tokens >= min(cost, self.capacity):
+            self.tokens -= cost
+            if ticket is not None:
+                ticket.set_result(None)
+            return
+
+        fut = ticket if ticket is not None else asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), fut, cost))
+        if self._pump_task is None or self._pump_task.done():
+            self._pump_task = asyncio.create_task(self._pump())
+        await fut
+
+    def promote(self, ticket: asyncio.Future, priority: int):
+        """Move a queued waiter into a higher-priority lane."""
+        for _, _, fut, cost in self._waiters:
+            if fut is ticket:
+                heapq.heappush(self._waiters, (priority, next(self._seq), ticket, cost))
+                return
+
+    async def _pump(self):
+        while self._waiters:
+            priority, _, fut, cost = self._waiters[0]
+            if fut.done():
+                # Cancelled, or already granted through a promoted duplicate
+                heapq.heappop(self._waiters)
+                continue
+
+            now = time.monotonic()
+            if now < self.paused_until:
+                await asyncio.sleep(self.paused_until - now)
+                continue
+
+            self._refill()
+            needed = min(cost, self.capacity)
+            if self.tokens >= needed:
+                self.tokens -= cost
+                heapq.heappop(self._waiters)
+                fut.set_result(None)
+            else:
+                await asyncio.sleep((needed - self.tokens) / self.rate)
+
+
+class _Flight:
+    """An in-flight coalesced call shared by every caller asking for the same thing."""
+
+    def __init__(self, priority: int):
+        self.priority = priority
+        self.ticket: Optional[asyncio.Future] = None
+        self.bucket: Optional[TokenBucket] = None
+        self.task: Optional[asyncio.Task] = None
+
+
+class RpcScheduler:
+    """Schedules all RPC traffic through rate budgets, retries and coalescing.
+
+    Exposes the same call / call_batch / get_json / close interface as
+    SolanaRpcClient, so it can be dropped in front of it.
+    """
+
+    def __init__(self, client: SolanaRpcClient, rate: float = 10.0,
+                 method_rates: Optional[Dict[str, float]] = None, max_retries: int = 5,
+                 base_delay: float = 0.5, max_delay: float = 30.0):
+        self.client = client
+        self.rate = rate
+        self.method_rates = dict(method_rates or {})
+        self.shares = 1
+        self.global_bucket = TokenBucket(rate)
+        self.method_buckets = {
+            method: TokenBucket(method_rate) for method, method_rate in self.method_rates.items()
+        }
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._inflight: Dict[Tuple[str, str], _Flight] = {}
+        self.stats = Counter()
+        # Per-method request timings (each attempt, including failures) and failure counts
+        self.latency = HistogramFamily("solana_rpc_request_seconds", "method",
+                                       "Time spent on each RPC attempt; batched calls are timed per batch")
+        self.method_errors = Counter()
+        self.method_rate_limited = Counter()
+
+    def share(self, workers: int):
+        """Use 1/workers of the configured budgets, for when that many processes share the provider."""
+        workers = max(1, workers)
+        if workers == self.shares:
+            return
+        self.shares = workers
+        self.global_bucket.set_rate(self.rate / workers)
+        for method, bucket in self.method_buckets.items():
+            bucket.set_rate(self.method_rates[method] / workers)
+
+    def _buckets(self, method: str) -> List[TokenBucket]:
+        bucket = self.method_buckets.get(method)
+        return [bucket, self.global_bucket] if bucket else [self.global_bucket]
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        # Full jitter, but never retry sooner than the provider asked us to
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def _record_error(self, method: str, error: Exception):
+        self.method_errors[method] += 1
+        if isinstance(error, RpcError) and error.rate_limited:
+            self.method_rate_limited[method] += 1
+
+    def _throttled(self, method: str, error: Exception):
+        """Back the budgets off after the provider told us to slow down."""
+        if isinstance(error, RpcError) and error.rate_limited:
+            self.stats["rate_limited"] += 1
+            pause = error.retry_after if error.retry_after is not None else self.base_delay
+            # Pause the most specific budget: the method's own bucket if it has one
+            self._buckets(method)[0].pause(pause)
+
+    async def _acquire(self, method: str, cost: float, flight: Optional[_Flight] = None):
+        for bucket in self._buckets(method):
+            priority = flight.priority if flight else rpc_priority.get()
+            ticket = asyncio.get_running_loop().create_future()
+            if flight:
+                flight.ticket, flight.bucket = ticket, bucket
+            await bucket.acquire(priority, cost, ticket=ticket)
+        if flight:
+            flight.ticket = flight.bucket = None
+
+    async def _execute(self, method: str, params: Any, timeout: Optional[float], flight: _Flight) -> Any:
+        for attempt in range(self.max_retries + 1):
+            await self._acquire(method, 1, flight)
+            started = time.perf_counter()
+            try:
+                self.stats["calls"] += 1
+                result = await self.client.call(method, params, timeout=timeout)
+                self.latency.observe(method, time.perf_counter() - started)
+                return result
+            except Exception as e:
+                self.latency.observe(method, time.perf_counter() - started)
+                self._record_error(method, e)
+                if not is_retryable(e) or attempt == self.max_retries:
+                    self.stats["failures"] += 1
+                    raise
+                self._throttled(method, e)
+                self.stats["retries"] += 1
+                delay = self._backoff(attempt, e)
+                logger.warning(f"{method} failed ({e}), retrying in {delay:.2f}s "
+                               f"(attempt {attempt + 1}/{self.max_retries})")
+                await asyncio.sleep(delay)
+
+    async def call(self, method: str, params: Any = None, timeout: Optional[float] = None) -> Any:
+        """Perform a scheduled JSON-RPC call, sharing identical in-flight calls."""
+        key = (method, json.dumps(params, sort_keys=True, default=str))
+        priority = rpc_priority.get()
+
+        flight = self._inflight.get(key)
+        if flight is not None:
+            self.stats["coalesced"] += 1
+            # An interactive caller joining a queued background call pulls it forward
+            if priority < flight.priority:
+                flight.priority = priority
+                if flight.ticket is not None and not flight.ticket.done():
+                    flight.bucket.promote(flight.ticket, priority)
+        else:
+            flight = _Flight(priority)
+            flight.task = asyncio.create_task(self._execute(method, params, timeout, flight))
+            self._inflight[key] = flight
+            flight.task.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        # Shielded so one caller going away doesn't cancel the call for everyone else
+        return await asyncio.shield(flight.task)
+
+    async def call_batch(self, calls: List[Tuple[str, Any]], timeout: Optional[float] = None) -> List[Any]:
+        """Send a scheduled JSON-RPC batch, retrying only the entries that failed transiently."""
+        results: List[Any] = [None] * len(calls)
+        pending = list(range(len(calls)))
+
+        for attempt in range(self.max_retries + 1):
+            batch = [calls[i] for i in pending]
+            for method, count in Counter(method for method, _ in batch).items():
+                await self._acquire(method, count)
+
+            self.stats["calls"] += len(batch)
+            started = time.perf_counter()
+            try:
+                batch_results = await self.client.call_batch(batch, timeout=timeout)
+            except Exception as e:
+                if not is_retryable(e) or attempt == self.max_retries:
+                    self.stats["failures"] += len(batch)
+                    for method, _ in batch:
+                        self._record_error(method, e)
+                    raise
+                batch_results = [e] * len(batch)
+            finally:
+                elapsed = time.perf_counter() - started
+                for method in set(method for method, _ in batch):
+                    self.latency.observe(method, elapsed)
+
+            for i, result in zip(pending, batch_results):
+                results[i] = result
+                if isinstance(result, Exception):
+                    self._record_error(calls[i][0], result)
+            pending = [i for i in pending if isinstance(results[i], Exception) and is_retryable(results[i])]
+            if not pending or attempt == self.max_retries:
+                break
+
+            error = results[pending[0]]
+            self._throttled(calls[pending[0]][0], error)
+            self.stats["retries"] += len(pending)
+            delay = self._backoff(attempt, error)
+            logger.warning(f"{len(pending)} batched calls failed ({error}), retrying in {delay:.2f}s "
+                           f"(attempt {attempt + 1}/{self.max_retries})")
+            await asyncio.sleep(delay)
+
+        self.stats["failures"] += sum(1 for r in results if isinstance(r, Exception))
+        return results
+
+    async def get_json(self, url: str, params: Optional[Dict[str, Any]] = None,
+                       timeout: Optional[float] = None) -> Any:
+        return await self.client.get_json(url, params=params, timeout=timeout)
+
+    async def get_if_changed(self, url: str, validators: Optional[Dict[str, str]] = None,
+                             timeout: Optional[float] = None):
+        return await self.client.get_if_changed(url, validators=validators, timeout=timeout)
+
+    async def close(self):
+        await self.client.close()
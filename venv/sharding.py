@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# Solana Address Scanner - Worker sharding
+# Consistent hash ring deciding which worker process owns (sweeps and keeps
+# PubSub subscriptions for) each address. When a worker joins or leaves,
+# only roughly 1/N of the addresses change owner
+
+import bisect
+import hashlib
+from typing import Iterable, List, Tuple
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Consistent hash ring with virtual nodes for an even spread."""
+
+    def __init__(self, workers: Iterable[str] = (), replicas: int = 100):
+        self.replicas = replicas
+        self.workers: Tuple[str, ...] = ()
+        self._points: List[int] = []
+        self._owners: List[str] = []
+        self.rebuild(workers)
+
+    def rebuild(self, workers: Iterable[str]) -> bool:
+        """Replace the ring's members. Returns True if membership changed."""
+        workers = tuple(sorted(set(workers)))
+        if workers == self.workers:
+            return False
+        ring = sorted((_hash(f"{worker}#{i}"), worker) for worker in workers for i in range(self.replicas))
+        self.workers = workers
+        self._points = [point for point, _ in ring]
+        self._owners = [worker for _, worker in ring]
+        return True
+
+    def owner(self, address: str) -> str:
+        if not self._points:
+            raise LookupError("hash ring has no workers")
+        index = bisect.bisect(self._points, _hash(address)) % len(self._points)
+        return self._owners[index]
+
+    def owns(self, worker: str, address: str) -> bool:
+        # With no ring yet (e.g. before the first heartbeat) every worker owns everything
+        return not self._points or self.owner(address) == worker
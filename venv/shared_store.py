@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+# Solana Address Scanner - Shared state store
+# Account snapshots, portfolio history, the tracked wallet set and worker
+# heartbeats, shared by every worker process. Each worker keeps a local
+# mirror in address_data; its writes are buffered and flushed in batches,
+# and updates written by other workers are relayed back to it by polling
+# the store's update log. SQLite locally, Redis when STORE_URL is redis://
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+
+# Redis is only needed for deployments spanning several hosts
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+logger = logging.getLogger("solana_scanner")
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DB_PATH = os.path.join(BASE_DIR, "scanner_state.db")
+
+# How long relayed updates are kept in the log, and how many history points per wallet
+UPDATE_LOG_SECONDS = 300
+HISTORY_POINTS = 30
+
+# Seconds a SQLite query waits on another worker's write lock before failing;
+# the loops calling the store retry on their next pass
+BUSY_TIMEOUT = 5
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS accounts (
+    address    TEXT PRIMARY KEY,
+    record     TEXT NOT NULL,
+    worker     TEXT NOT NULL,
+    updated_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS updates (
+    seq        INTEGER PRIMARY KEY AUTOINCREMENT,
+    address    TEXT NOT NULL,
+    worker     TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS history (
+    address   TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    value     REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS history_by_address ON history (address, timestamp);
+CREATE TABLE IF NOT EXISTS tracked (
+    address    TEXT PRIMARY KEY,
+    watched_at REAL NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS workers (
+    worker  TEXT PRIMARY KEY,
+    seen_at REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+class SharedStore(ABC):
+    """Interface shared by the store backends.
+
+    save() is synchronous and only buffers the record; flush() writes the
+    buffered records in one batch and appends them to the update log that
+    other workers read with poll_updates().
+    """
+
+    def __init__(self, worker_id: str):
+        self.worker_id = worker_id
+        self._dirty: Dict[str, dict] = {}
+
+    def save(self, address: str, record: dict):
+        # Only the latest record per address is written
+        self._dirty[address] = record
+
+    async def flush(self) -> int:
+        if not self._dirty:
+            return 0
+        batch, self._dirty = self._dirty, {}
+        await self._write_accounts(batch)
+        return len(batch)
+
+    @abstractmethod
+    async def _write_accounts(self, batch: Dict[str, dict]):
+        ...
+
+    @abstractmethod
+    async def load_accounts(self) -> Dict[str, dict]:
+        ...
+
+    @abstractmethod
+    async def poll_updates(self) -> List[Tuple[str, dict]]:
+        """Records written by other workers since the last poll."""
+
+    @abstractmethod
+    async def append_history(self, address: str, point: dict, keep: int = HISTORY_POINTS) -> List[dict]:
+        """Add a portfolio value point and return the wallet's latest points, oldest first."""
+
+    @abstractmethod
+    async def track(self, address: str):
+        """Add a wallet to the tracked set (or mark it as just watched)."""
+
+    @abstractmethod
+    async def touch(self, addresses: List[str]):
+        """Mark already tracked wallets as still being watched."""
+
+    @abstractmethod
+    async def untrack(self, address: str):
+        ...
+
+    @abstractmethod
+    async def expire_tracked(self, max_idle: float) -> List[str]:
+        """Drop wallets nobody has watched for max_idle seconds and return them."""
+
+    @abstractmethod
+    async def tracked(self) -> List[str]:
+        ...
+
+    @abstractmethod
+    async def heartbeat(self):
+        ...
+
+    @abstractmethod
+    async def live_workers(self, ttl: float) -> List[str]:
+        ...
+
+    async def close(self):
+        pass
+
+
+class SqliteStore(SharedStore):
+    """Store backed by a SQLite file shared by the worker processes on one host.
+
+    Queries run in a worker thread so waiting on another process's write
+    lock never stalls the event loop; a lock keeps them one at a time on
+    the shared connection.
+    """
+
+    def __init__(self, worker_id: str, db_path: str = DEFAULT_DB_PATH):
+        super().__init__(worker_id)
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, timeout=BUSY_TIMEOUT)
+        self._lock = threading.Lock()
+        # WAL lets every worker read while one of them writes
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(tracked)")]
+        if "watched_at" not in columns:
+            # Stores created before wallets could expire
+            with self.conn:
+                self.conn.execute("ALTER TABLE tracked ADD COLUMN watched_at REAL NOT NULL DEFAULT 0")
+                self.conn.execute("UPDATE tracked SET watched_at = ?", (time.time(),))
+        # Only relay what is written after we start
+        self.last_seq = self.conn.execute("SELECT COALESCE(MAX(seq), 0) FROM updates").fetchone()[0]
+
+    async def _run(self, func, *args):
+        def locked():
+            with self._lock:
+                return func(*args)
+        return await asyncio.to_thread(locked)
+
+    async def _write_accounts(self, batch: Dict[str, dict]):
+        def write():
+            now = time.time()
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO accounts (address, record, worker, updated_at) VALUES (?, ?, ?, ?)",
+                    [(address, json.dumps(record), self.worker_id, now) for address, record in batch.items()]
+                )
+                self.conn.executemany(
+                    "INSERT INTO updates (address, worker, created_at) VALUES (?, ?, ?)",
+                    [(address, self.worker_id, now) for address in batch]
+                )
+                self.conn.execute("DELETE FROM updates WHERE created_at < ?", (now - UPDATE_LOG_SECONDS,))
+        await self._run(write)
+
+    async def load_accounts(self) -> Dict[str, dict]:
+        rows = await self._run(lambda: self.conn.execute("SELECT address, record FROM accounts").fetchall())
+        return {address: json.loads(record) for address, record in rows}
+
+    async def poll_updates(self) -> List[Tuple[str, dict]]:
+        rows = await self._run(lambda: self.conn.execute(
+            """SELECT u.seq, u.address, a.record FROM updates u JOIN accounts a ON a.address = u.address
+               WHERE u.seq > ? AND u.worker != ? ORDER BY u.seq""",
+            (self.last_seq, self.worker_id)
+        ).fetchall())
+        if not rows:
+            return []
+        self.last_seq = rows[-1][0]
+        # Several updates to one address in a poll only need the latest record
+        latest = {address: record for _, address, record in rows}
+        return [(address, json.loads(record)) for address, record in latest.items()]
+
+    async def append_history(self, address: str, point: dict, keep: int = HISTORY_POINTS) -> List[dict]:
+        def append():
+            with self.conn:
+                self.conn.execute("INSERT INTO history (address, timestamp, value) VALUES (?, ?, ?)",
+                                  (address, point["timestamp"], point["value"]))
+                self.conn.execute(
+                    """DELETE FROM history WHERE address = ? AND timestamp NOT IN (
+                           SELECT timestamp FROM history WHERE address = ? ORDER BY timestamp DESC LIMIT ?)""",
+                    (address, address, keep)
+                )
+            return self.conn.execute(
+                "SELECT timestamp, value FROM history WHERE address = ? ORDER BY timestamp", (address,)
+            ).fetchall()
+        rows = await self._run(append)
+        return [{"timestamp": timestamp, "value": value} for timestamp, value in rows]
+
+    async def track(self, address: str):
+        def track():
+            with self.conn:
+                self.conn.execute("INSERT OR REPLACE INTO tracked (address, watched_at) VALUES (?, ?)",
+                                  (address, time.time()))
+        await self._run(track)
+
+    async def touch(self, addresses: List[str]):
+        def touch():
+            now = time.time()
+            with self.conn:
+                self.conn.executemany("UPDATE tracked SET watched_at = ? WHERE address = ?",
+                                      [(now, address) for address in addresses])
+        await self._run(touch)
+
+    async def untrack(self, address: str):
+        def untrack():
+            with self.conn:
+                self.conn.execute("DELETE FROM tracked WHERE address = ?", (address,))
+        await self._run(untrack)
+
+    async def expire_tracked(self, max_idle: float) -> List[str]:
+        def expire():
+            cutoff = time.time() - max_idle
+            with self.conn:
+                expired = [row[0] for row in self.conn.execute(
+                    "SELECT address FROM tracked WHERE watched_at < ?", (cutoff,))]
+                self.conn.execute("DELETE FROM tracked WHERE watched_at < ?", (cutoff,))
+            return expired
+        return await self._run(expire)
+
+    async def tracked(self) -> List[str]:
+        rows = await self._run(lambda: self.conn.execute("SELECT address FROM tracked").fetchall())
+        return [row[0] for row in rows]
+
+    async def heartbeat(self):
+        def heartbeat():
+            with self.conn:
+                self.conn.execute("INSERT OR REPLACE INTO workers (worker, seen_at) VALUES (?, ?)",
+                                  (self.worker_id, time.time()))
+        await self._run(heartbeat)
+
+    async def live_workers(self, ttl: float) -> List[str]:
+        rows = await self._run(lambda: self.conn.execute(
+            "SELECT worker FROM workers WHERE seen_at >= ? ORDER BY worker", (time.time() - ttl,)
+        ).fetchall())
+        return [row[0] for row in rows]
+
+    async def close(self):
+        def close():
+            with self.conn:
+                # Leave the ring straight away instead of waiting for the TTL
+                self.conn.execute("DELETE FROM workers WHERE worker = ?", (self.worker_id,))
+            self.conn.close()
+        await self._run(close)
+
+
+class RedisStore(SharedStore):
+    """Store backed by Redis (or anything speaking its protocol), for workers on several hosts."""
+
+    def __init__(self, worker_id: str, url: str, prefix: str = "solana_scanner"):
+        if aioredis is None:
+            raise RuntimeError("STORE_URL points at Redis but the 'redis' package is not installed")
+        super().__init__(worker_id)
+        self.redis = aioredis.from_url(url, decode_responses=True)
+        self.prefix = prefix
+        self.last_id: Optional[str] = None
+
+    def _key(self, *parts: str) -> str:
+        return ":".join((self.prefix,) + parts)
+
+    async def _write_accounts(self, batch: Dict[str, dict]):
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.hset(self._key("accounts"), mapping={address: json.dumps(record) for address, record in batch.items()})
+        for address in batch:
+            # The update log is a capped stream; readers fetch the record itself from the hash
+            pipe.xadd(self._key("updates"), {"address": address, "worker": self.worker_id},
+                      maxlen=10000, approximate=True)
+        await pipe.execute()
+
+    async def load_accounts(self) -> Dict[str, dict]:
+        records = await self.redis.hgetall(self._key("accounts"))
+        return {address: json.loads(record) for address, record in records.items()}
+
+    async def poll_updates(self) -> List[Tuple[str, dict]]:
+        if self.last_id is None:
+            # Only relay what is written after we start
+            last = await self.redis.xrevrange(self._key("updates"), count=1)
+            self.last_id = last[0][0] if last else "0-0"
+            return []
+        streams = await self.redis.xread({self._key("updates"): self.last_id}, count=1000)
+        if not streams:
+            return []
+        entries = streams[0][1]
+        self.last_id = entries[-1][0]
+        addresses = list(dict.fromkeys(
+            fields["address"] for _, fields in entries if fields.get("worker") != self.worker_id
+        ))
+        if not addresses:
+            return []
+        records = await self.redis.hmget(self._key("accounts"), addresses)
+        return [(address, json.loads(record)) for address, record in zip(addresses, records) if record]
+
+    async def append_history(self, address: str, point: dict, keep: int = HISTORY_POINTS) -> List[dict]:
+        key = self._key("history", address)
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.rpush(key, json.dumps(point))
+        pipe.ltrim(key, -keep, -1)
+        pipe.lrange(key, 0, -1)
+        *_, points = await pipe.execute()
+        return [json.loads(p) for p in points]
+
+    async def track(self, address: str):
+        # A sorted set scored by when the wallet was last watched
+        await self.redis.zadd(self._key("tracked"), {address: time.time()})
+
+    async def touch(self, addresses: List[str]):
+        if addresses:
+            # xx: only update wallets that are still tracked
+            await self.redis.zadd(self._key("tracked"), {address: time.time() for address in addresses}, xx=True)
+
+    async def untrack(self, address: str):
+        await self.redis.zrem(self._key("tracked"), address)
+
+    async def expire_tracked(self, max_idle: float) -> List[str]:
+        cutoff = time.time() - max_idle
+        expired = await self.redis.zrangebyscore(self._key("tracked"), "-inf", f"({cutoff}")
+        if expired:
+            await self.redis.zrem(self._key("tracked"), *expired)
+        return expired
+
+    async def tracked(self) -> List[str]:
+        return list(await self.redis.zrange(self._key("tracked"), 0, -1))
+
+    async def heartbeat(self):
+        await self.redis.zadd(self._key("workers"), {self.worker_id: time.time()})
+
+    async def live_workers(self, ttl: float) -> List[str]:
+        return sorted(await self.redis.zrangebyscore(self._key("workers"), time.time() - ttl, "+inf"))
+
+    async def close(self):
+        await self.redis.zrem(self._key("workers"), self.worker_id)
+        await self.redis.aclose()
+
+
+def open_store(url: str, worker_id: str) -> SharedStore:
+    """Open the backend named by STORE_URL: redis://... or a SQLite file path."""
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisStore(worker_id, url)
+    if url.startswith("sqlite:///"):
+        url = url[len("sqlite:///"):]
+    return SqliteStore(worker_id, url or DEFAULT_DB_PATH)
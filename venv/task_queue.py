@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# Solana Address Scanner - Background task queue
+# Bounded queue of background jobs run by a fixed pool of worker tasks.
+# Jobs are keyed (e.g. by address): a job submitted while an identical one
+# is still waiting is dropped, so bursts of requests for one wallet collapse
+# into a single refresh. Jobs with the same key never run concurrently: one
+# submitted while its key is running is held back until that run finishes
+
+import asyncio
+import logging
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+logger = logging.getLogger("solana_scanner")
+
+
+class TaskQueue:
+    """Runs keyed background jobs on a fixed number of workers."""
+
+    def __init__(self, workers: int = 4, maxsize: int = 10000):
+        self.workers = workers
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.waiting: Dict[Hashable, Optional[asyncio.TimerHandle]] = {}  # key -> delay timer, if delayed
+        self.active: Set[Hashable] = set()  # Keys of the jobs running now
+        self.deferred: Dict[Hashable, tuple] = {}  # key -> follow-up job held until the running one ends
+        self.stats = Counter()
+        self._tasks: List[asyncio.Task] = []
+
+    def submit(self, key: Hashable, func: Callable[..., Awaitable[Any]], *args, delay: float = 0) -> bool:
+        """Queue func(*args) unless a job with the same key is already waiting.
+
+        With a delay the job only enters the queue once the delay has passed,
+        which debounces repeated submissions. Returns False if the job was
+        dropped as a duplicate or because the queue is full.
+        """
+        if key in self.waiting:
+            self.stats["deduplicated"] += 1
+            return False
+        if self.queue.full():
+            self.stats["rejected"] += 1
+            logger.warning(f"Task queue full, dropping job {key!r}")
+            return False
+        self.stats["submitted"] += 1
+        job = (key, func, args)
+        if delay > 0:
+            self.waiting[key] = asyncio.get_running_loop().call_later(delay, self._enqueue, job)
+        else:
+            self.waiting[key] = None
+            self._enqueue(job)
+        return True
+
+    def _enqueue(self, job: Tuple[Hashable, Callable[..., Awaitable[Any]], tuple]):
+        try:
+            self.queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.waiting.pop(job[0], None)
+            self.stats["rejected"] += 1
+            logger.warning(f"Task queue full, dropping job {job[0]!r}")
+
+    async def _worker(self):
+        while True:
+            key, func, args = await self.queue.get()
+            if key in self.active:
+                # Still waiting as far as submit() is concerned, so later
+                # duplicates keep collapsing into this follow-up run
+                self.deferred[key] = (key, func, args)
+                continue
+            # From here on a new submission for the key queues another run
+            self.waiting.pop(key, None)
+            self.active.add(key)
+            try:
+                await func(*args)
+                self.stats["completed"] += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats["failed"] += 1
+                logger.error(f"Background job {key!r} failed: {e}")
+            finally:
+                self.active.discard(key)
+                follow_up = self.deferred.pop(key, None)
+                if follow_up is not None:
+                    self._enqueue(follow_up)
+
+    @property
+    def running(self) -> int:
+        return len(self.active)
+
+    def start(self):
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for timer in self.waiting.values():
+            if timer is not None:
+                timer.cancel()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "queued": self.queue.qsize(),
+            "running": self.running,
+            **self.stats
+        }
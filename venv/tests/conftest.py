@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# Solana Address Scanner - Test fixtures
+# Points the app at local mock RPC and PubSub servers on free ports and keeps
+# its databases and log file in a temporary directory. The app module is
+# imported once; each test gets fresh in-memory state through `scanner` and
+# starts the mock chain inside its own event loop with `async with chain:`.
+
+import os
+import socket
+import sys
+import tempfile
+
+import pytest
+
+VENV_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, VENV_DIR)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+RPC_PORT = _free_port()
+WS_PORT = _free_port()
+STATE_DIR = tempfile.mkdtemp(prefix="solana_scanner_tests_")
+
+os.environ.update({
+    "SOLANA_RPC_URL": f"http://127.0.0.1:{RPC_PORT}",
+    "SOLANA_WS_URL": f"ws://127.0.0.1:{WS_PORT}",
+    "STORE_URL": os.path.join(STATE_DIR, "scanner_state.db"),
+    "TX_STORE_PATH": os.path.join(STATE_DIR, "transactions.db"),
+    "TOKEN_REGISTRY_PATH": os.path.join(STATE_DIR, "token_registry.db"),
+    "PUBSUB_DEBOUNCE": "0.05"
+})
+# The app logs to solana_scanner.log in the working directory
+os.chdir(STATE_DIR)
+
+import app as scanner_app  # noqa: E402
+from cache import Cache  # noqa: E402
+from mock_pubsub import MockPubSubServer  # noqa: E402
+from mock_rpc import MockRpcServer  # noqa: E402
+from pubsub import SubscriptionEngine  # noqa: E402
+from rpc_client import SolanaRpcClient  # noqa: E402
+from rpc_scheduler import RpcScheduler  # noqa: E402
+from sharding import HashRing  # noqa: E402
+from task_queue import TaskQueue  # noqa: E402
+
+
+def _fresh_cache(cache: Cache) -> Cache:
+    return Cache(expiry_seconds=cache.expiry, max_entries=cache.max_entries,
+                 stale_seconds=cache.stale, negative_seconds=cache.negative_expiry)
+
+
+class MockChain:
+    """Mock RPC and PubSub servers plus the app's loop-bound clients, for one event loop."""
+
+    def __init__(self, app, monkeypatch):
+        self.app = app
+        self.monkeypatch = monkeypatch
+        self.rpc = None
+        self.pubsub = None
+
+    async def __aenter__(self):
+        app, monkeypatch = self.app, self.monkeypatch
+        self.rpc = await MockRpcServer(port=RPC_PORT, wallets=5, tokens=2, signatures=5).start()
+        self.pubsub = await MockPubSubServer(port=WS_PORT).start()
+        rpc = RpcScheduler(SolanaRpcClient(app.SOLANA_RPC_URL), rate=1000)
+        monkeypatch.setattr(app, "rpc", rpc)
+        monkeypatch.setattr(app.tx_ingester, "rpc", rpc)
+        monkeypatch.setattr(app, "tasks", TaskQueue(workers=4))
+        monkeypatch.setattr(app, "pubsub", SubscriptionEngine(app.SOLANA_WS_URL, reconnect_delay=0.1))
+        app.tasks.start()
+        app.pubsub.start(app.handle_chain_notification)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        app = self.app
+        await app.tasks.stop()
+        await app.pubsub.stop()
+        await app.rpc.close()
+        await self.pubsub.stop()
+        await self.rpc.stop()
+
+
+@pytest.fixture
+def scanner(monkeypatch):
+    """The app module with empty in-memory state."""
+    app = scanner_app
+    monkeypatch.setattr(app, "address_data", {})
+    monkeypatch.setattr(app, "tracked_addresses", set())
+    monkeypatch.setattr(app, "notified_balances", {})
+    monkeypatch.setattr(app, "recently_watched", set())
+    monkeypatch.setattr(app, "manager", app.ConnectionManager(queue_size=64))
+    monkeypatch.setattr(app, "ring", HashRing())
+    for name in ("token_accounts_cache", "price_cache", "security_cache"):
+        monkeypatch.setattr(app, name, _fresh_cache(getattr(app, name)))
+    return app
+
+
+@pytest.fixture
+def chain(scanner, monkeypatch):
+    return MockChain(scanner, monkeypatch)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# Solana Address Scanner - PubSub tracking tests
+# Drives notifications through mock_pubsub.py and checks that they reach
+# subscribed clients as targeted refreshes and deltas
+
+import asyncio
+import json
+import time
+
+import websockets
+
+USDC_MINT = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
+
+
+async def wait_for(predicate, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out waiting for condition"
+        await asyncio.sleep(0.01)
+
+
+def drain(client) -> list:
+    messages = []
+    while not client.queue.empty():
+        messages.append(json.loads(client.queue.get_nowait()))
+    return messages
+
+
+def subscribed(server, address: str) -> set:
+    return {kind for _, kind, sub_address in server.subscriptions.values() if sub_address == address}
+
+
+async def load_wallet(app, chain):
+    """Fully load the first mock wallet and wait for both of its subscriptions."""
+    address = chain.rpc.wallets[0].address
+    await app.update_account_data(address)
+    await wait_for(lambda: subscribed(chain.pubsub, address) == {"account", "token"})
+    chain.rpc.counters.clear()
+    return address
+
+
+def test_balance_notification_refreshes_and_sends_delta(scanner, chain):
+    async def scenario():
+        async with chain:
+            address = await load_wallet(scanner, chain)
+            client = scanner.ClientConnection(None, 64)
+            scanner.manager.subscribe(client, [address])
+            version = drain(client)[0]["versions"][address]
+
+            await chain.pubsub.set_lamports(address, 42_000_000_000)
+            await wait_for(lambda: scanner.address_data[address]["balance"] == 42.0
+                           and scanner.address_data[address]["loadingStage"] == "complete")
+
+            deltas = [m for m in drain(client) if m["type"] == "account_delta"]
+            assert deltas and deltas[0]["version"] == version + 1
+            assert deltas[0]["changes"]["balance"] == 42.0
+            # The notification carried the balance, so it was not fetched again
+            assert chain.rpc.stats()["methods"].get("getBalance", 0) == 0
+
+    asyncio.run(scenario())
+
+
+def test_token_account_notification_patches_cached_accounts(scanner, chain):
+    async def scenario():
+        async with chain:
+            address = await load_wallet(scanner, chain)
+
+            await chain.pubsub.set_token_account(address, "TokenAccount1111", USDC_MINT, 2_500_000, 6)
+
+            def usdc():
+                portfolio = scanner.address_data[address].get("portfolio", [])
+                return [token for token in portfolio if token.get("mint") == USDC_MINT]
+            await wait_for(lambda: usdc() and scanner.address_data[address]["loadingStage"] == "complete")
+
+            assert usdc()[0]["balance"] == 2.5
+            # The cached token account list was patched rather than refetched
+            assert chain.rpc.stats()["methods"].get("getTokenAccountsByOwner", 0) == 0
+
+    asyncio.run(scenario())
+
+
+def test_resubscribes_after_dropped_connections(scanner, chain):
+    async def scenario():
+        async with chain:
+            address = await load_wallet(scanner, chain)
+
+            async with websockets.connect(chain.pubsub.url) as control:
+                await control.send(json.dumps({"jsonrpc": "2.0", "id": 1, "method": "mock_dropConnections"}))
+                await control.recv()
+            await wait_for(lambda: scanner.pubsub.stats["reconnects"] >= 1
+                           and subscribed(chain.pubsub, address) == {"account", "token"})
+
+            # Notifications may have been missed while disconnected, so the wallet is refreshed
+            await wait_for(lambda: chain.rpc.stats()["methods"].get("getTokenAccountsByOwner", 0) >= 1)
+
+            await chain.pubsub.set_lamports(address, 7_000_000_000)
+            await wait_for(lambda: scanner.address_data[address]["balance"] == 7.0)
+
+    asyncio.run(scenario())
+
+
+def test_retries_rejected_subscriptions(scanner, chain):
+    async def scenario():
+        async with chain:
+            address = chain.rpc.wallets[0].address
+            await wait_for(lambda: scanner.pubsub.status()["connections"] == 1)
+            chain.pubsub.failing_subscribes = 3
+
+            scanner.pubsub.track(address)
+            await wait_for(lambda: subscribed(chain.pubsub, address) == {"account", "token"})
+            assert scanner.pubsub.stats["subscribe_errors"] == 3
+            assert scanner.pubsub.stats["reconnects"] == 0
+
+    asyncio.run(scenario())
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# Solana Address Scanner - RPC scheduler tests
+# Token bucket priority lanes and promotion, Retry-After pauses and
+# single-flight coalescing, against an in-process fake client
+
+import asyncio
+import time
+
+from rpc_client import RpcError
+from rpc_scheduler import (PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE, RpcScheduler, TokenBucket,
+                           rpc_priority)
+
+
+class FakeClient:
+    """Answers every call after `delay`, failing first with the queued errors."""
+
+    def __init__(self, delay: float = 0.0, errors=()):
+        self.delay = delay
+        self.errors = list(errors)
+        self.calls = []
+
+    async def call(self, method, params=None, timeout=None):
+        self.calls.append((method, params))
+        await asyncio.sleep(self.delay)
+        if self.errors:
+            raise self.errors.pop(0)
+        return {"method": method, "params": params}
+
+    async def call_batch(self, calls, timeout=None):
+        return [await self.call(method, params) for method, params in calls]
+
+    async def close(self):
+        pass
+
+
+def _grant_order(bucket: TokenBucket, waiters):
+    order = []
+
+    async def wait(name, priority, ticket=None):
+        await bucket.acquire(priority, ticket=ticket)
+        order.append(name)
+
+    return order, [asyncio.create_task(wait(*waiter)) for waiter in waiters]
+
+
+def test_bucket_serves_interactive_lane_first():
+    async def scenario():
+        bucket = TokenBucket(rate=50, burst=1)
+        await bucket.acquire()  # Spend the burst so everything below has to queue
+        order, tasks = _grant_order(bucket, [
+            ("background-1", PRIORITY_BACKGROUND),
+            ("background-2", PRIORITY_BACKGROUND),
+            ("interactive", PRIORITY_INTERACTIVE)
+        ])
+        await asyncio.gather(*tasks)
+        assert order == ["interactive", "background-1", "background-2"]
+
+    asyncio.run(scenario())
+
+
+def test_promoted_waiter_jumps_the_background_lane():
+    async def scenario():
+        bucket = TokenBucket(rate=50, burst=1)
+        await bucket.acquire()
+        ticket = asyncio.get_running_loop().create_future()
+        order, tasks = _grant_order(bucket, [
+            ("background-1", PRIORITY_BACKGROUND),
+            ("background-2", PRIORITY_BACKGROUND),
+            ("promoted", PRIORITY_BACKGROUND, ticket)
+        ])
+        await asyncio.sleep(0)  # Let every waiter queue up
+        bucket.promote(ticket, PRIORITY_INTERACTIVE)
+        await asyncio.gather(*tasks)
+        assert order == ["promoted", "background-1", "background-2"]
+
+    asyncio.run(scenario())
+
+
+def test_interactive_caller_promotes_coalesced_background_call():
+    async def scenario():
+        client = FakeClient()
+        scheduler = RpcScheduler(client, rate=50)
+        scheduler.global_bucket = TokenBucket(rate=50, burst=1)
+        await scheduler.global_bucket.acquire()
+        order = []
+
+        async def call(name, params, priority):
+            rpc_priority.set(priority)
+            await scheduler.call("getBalance", params)
+            order.append(name)
+
+        tasks = [asyncio.create_task(call("other", ["B"], PRIORITY_BACKGROUND)),
+                 asyncio.create_task(call("shared", ["A"], PRIORITY_BACKGROUND))]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(call("shared", ["A"], PRIORITY_INTERACTIVE)))
+        await asyncio.gather(*tasks)
+
+        assert order == ["shared", "shared", "other"]
+        assert client.calls.count(("getBalance", ["A"])) == 1
+        assert scheduler.stats["coalesced"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_retry_after_pauses_the_bucket():
+    async def scenario():
+        client = FakeClient(errors=[RpcError("getBalance", {"code": 429}, retry_after=0.3)])
+        scheduler = RpcScheduler(client, rate=100, base_delay=0.01)
+        started = time.monotonic()
+        result = await scheduler.call("getBalance", ["A"])
+        elapsed = time.monotonic() - started
+
+        assert result == {"method": "getBalance", "params": ["A"]}
+        assert len(client.calls) == 2
+        assert elapsed >= 0.3
+        assert scheduler.stats["rate_limited"] == 1
+        assert scheduler.method_rate_limited["getBalance"] == 1
+
+        # Other calls sharing the budget wait out the pause too
+        scheduler.global_bucket.pause(0.2)
+        started = time.monotonic()
+        await scheduler.call("getSlot")
+        assert time.monotonic() - started >= 0.2
+
+    asyncio.run(scenario())
+
+
+def test_cancelling_one_coalesced_caller_keeps_the_call_for_the_others():
+    async def scenario():
+        client = FakeClient(delay=0.1)
+        scheduler = RpcScheduler(client, rate=100)
+        first = asyncio.create_task(scheduler.call("getBalance", ["A"]))
+        second = asyncio.create_task(scheduler.call("getBalance", ["A"]))
+        await asyncio.sleep(0.02)
+
+        first.cancel()
+        assert await second == {"method": "getBalance", "params": ["A"]}
+        assert first.cancelled()
+        assert len(client.calls) == 1
+        assert scheduler.stats["coalesced"] == 1
+        assert not scheduler._inflight
+
+    asyncio.run(scenario())
+
+
+def test_batches_larger_than_the_bucket_pay_their_full_cost():
+    async def scenario():
+        scheduler = RpcScheduler(FakeClient(), rate=200)
+        scheduler.share(4)  # 50 calls/s with a burst of 50
+        await scheduler.call_batch([("getBalance", [str(i)]) for i in range(100)])
+        assert scheduler.global_bucket.tokens < -49
+
+        # The next call waits until the 50 calls over the burst are paid back
+        started = time.monotonic()
+        await scheduler.call("getSlot")
+        assert time.monotonic() - started >= 0.9
+
+    asyncio.run(scenario())
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+# Solana Address Scanner - Token registry tests
+# Conditional refreshes of the token list against a fake HTTP client
+
+import asyncio
+import json
+import os
+
+from token_registry import TokenRegistry
+
+USDC_MINT = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
+
+
+class FakeHttp:
+    """Serves one token list, then answers 304 Not Modified."""
+
+    def __init__(self, token_list):
+        self.body = json.dumps(token_list).encode()
+        self.requests = []
+
+    async def get_if_changed(self, url, validators=None, timeout=None):
+        self.requests.append(validators)
+        if validators:
+            return None, validators
+        return self.body, {"etag": '"v1"'}
+
+
+def test_refresh_merges_the_list_and_then_revalidates(tmp_path):
+    async def scenario():
+        registry = TokenRegistry(os.path.join(tmp_path, "tokens.db"), snapshot_path=None)
+        http = FakeHttp([{"address": USDC_MINT, "symbol": "USDC", "name": "USD Coin", "decimals": 6,
+                          "logoURI": "https://example.invalid/usdc.png"}])
+        try:
+            assert await registry.refresh(http, "https://tokens.invalid/all") == 1
+            assert registry.get(USDC_MINT)["symbol"] == "USDC"
+
+            assert await registry.refresh(http, "https://tokens.invalid/all") == 0
+            assert http.requests == [{}, {"etag": '"v1"'}]
+        finally:
+            registry.close()
+
+    asyncio.run(scenario())
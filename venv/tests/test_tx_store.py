@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# Solana Address Scanner - Transaction store tests
+# Syncs and back-fills mock wallet histories into a temporary store
+
+import asyncio
+import os
+
+from tx_store import TransactionIngester, TransactionStore
+
+
+def test_backfill_stopped_at_the_limit_is_truncated(scanner, chain, tmp_path):
+    async def scenario():
+        async with chain:
+            address = chain.rpc.wallets[0].address
+            store = TransactionStore(os.path.join(tmp_path, "transactions.db"))
+            ingester = TransactionIngester(store, scanner.rpc, initial_page=2, page_size=2, backfill_max=3)
+            try:
+                assert await ingester.sync(address)
+                await ingester.backfill(address)
+
+                stats = await store.history_stats(address)
+                assert await store.count(address) == 4
+                assert stats["truncated"]
+                # The oldest stored signature is not the wallet's first transaction
+                assert not stats["historyComplete"]
+                assert address not in await store.incomplete_backfills()
+            finally:
+                await store.close()
+
+    asyncio.run(scenario())
+
+
+def test_truncated_history_skips_the_new_wallet_signal(scanner, chain, monkeypatch, tmp_path):
+    async def scenario():
+        async with chain:
+            address = chain.rpc.wallets[0].address
+            store = TransactionStore(os.path.join(tmp_path, "transactions.db"))
+            monkeypatch.setattr(scanner, "tx_store", store)
+            monkeypatch.setattr(scanner.tx_ingester, "store", store)
+            monkeypatch.setattr(scanner.tx_ingester, "initial_page", 2)
+            monkeypatch.setattr(scanner.tx_ingester, "page_size", 2)
+            monkeypatch.setattr(scanner.tx_ingester, "backfill_max", 1)
+            await scanner.tx_ingester.sync(address)
+            await scanner.tx_ingester.backfill(address)
+
+            try:
+                security = await scanner.check_security_issues(address)
+                assert "new_wallet" not in {issue["type"] for issue in security["issues"]}
+            finally:
+                await store.close()
+
+    asyncio.run(scenario())
+
+
+def test_sync_only_backfills_owned_addresses(scanner, chain, tmp_path):
+    async def scenario():
+        async with chain:
+            owned, other = chain.rpc.wallets[0].address, chain.rpc.wallets[1].address
+            store = TransactionStore(os.path.join(tmp_path, "transactions.db"))
+            ingester = TransactionIngester(store, scanner.rpc, initial_page=2, page_size=2)
+            await ingester.start(lambda address: address == owned)
+            try:
+                assert await ingester.sync(owned)
+                assert await ingester.sync(other)
+                assert other not in ingester._queued
+                await asyncio.sleep(0.1)
+                # Only the first page of the other wallet was fetched
+                assert await store.count(other) == 2
+                assert not (await store.get_cursor(other))["backfill_complete"]
+            finally:
+                ingester.stop()
+                await store.close()
+
+    asyncio.run(scenario())
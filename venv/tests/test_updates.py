@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# Solana Address Scanner - Progressive update tests
+# Checks that the staged refresh only sends clients the fields that changed
+
+import asyncio
+import json
+
+
+def drain(client) -> list:
+    messages = []
+    while not client.queue.empty():
+        messages.append(json.loads(client.queue.get_nowait()))
+    return messages
+
+
+def test_unchanged_refresh_sends_only_bookkeeping_fields(scanner, chain):
+    async def scenario():
+        async with chain:
+            address = chain.rpc.wallets[0].address
+            await scanner.update_account_data(address)
+            client = scanner.ClientConnection(None, 64)
+            scanner.manager.subscribe(client, [address])
+            drain(client)
+
+            await scanner.update_account_data(address)
+
+            deltas = [m for m in drain(client) if m["type"] == "account_delta"]
+            assert deltas
+            for delta in deltas:
+                assert delta["removed"] == []
+                assert set(delta["changes"]) <= {"lastUpdated", "loadingStage"}
+            assert scanner.address_data[address]["loadingStage"] == "complete"
+
+    asyncio.run(scenario())
+
+
+def test_changed_balance_keeps_unrefreshed_fields(scanner, chain):
+    async def scenario():
+        async with chain:
+            address = chain.rpc.wallets[0].address
+            await scanner.update_account_data(address)
+            client = scanner.ClientConnection(None, 64)
+            scanner.manager.subscribe(client, [address])
+            drain(client)
+
+            await scanner.update_account_data(address, balance=99.0)
+
+            deltas = [m for m in drain(client) if m["type"] == "account_delta"]
+            first = deltas[0]
+            # The basic info stage leaves the other panels in place
+            assert first["changes"]["balance"] == 99.0
+            assert first["removed"] == []
+            assert "recentTransactions" not in first["changes"]
+            sol = [t for t in scanner.address_data[address]["portfolio"] if t["symbol"] == "SOL"]
+            assert sol[0]["balance"] == 99.0
+
+    asyncio.run(scenario())
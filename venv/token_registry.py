@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# Solana Address Scanner - Token registry
+# Compact SQLite-backed index of token metadata keyed by mint address.
+# Seeded from a shipped snapshot so startup never waits on the network,
+# and refreshed incrementally in the background from the token list API.
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger("solana_scanner")
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DB_PATH = os.path.join(BASE_DIR, "token_registry.db")
+DEFAULT_SNAPSHOT_PATH = os.path.join(BASE_DIR, "token_registry_snapshot.json")
+
+# SQLite's default limit on bound parameters is 999
+LOOKUP_CHUNK = 900
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tokens (
+    mint     TEXT PRIMARY KEY,
+    symbol   TEXT NOT NULL,
+    name     TEXT NOT NULL,
+    decimals INTEGER NOT NULL,
+    logo     TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+# Only write rows that are new or actually changed
+UPSERT = """
+INSERT INTO tokens (mint, symbol, name, decimals, logo) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT(mint) DO UPDATE SET
+    symbol = excluded.symbol, name = excluded.name,
+    decimals = excluded.decimals, logo = excluded.logo
+WHERE symbol IS NOT excluded.symbol OR name IS NOT excluded.name
+   OR decimals IS NOT excluded.decimals OR logo IS NOT excluded.logo
+"""
+
+
+def compact_row(token: Dict[str, Any]) -> Optional[tuple]:
+    """Reduce a token list entry to (mint, symbol, name, decimals, logo)."""
+    mint = token.get("address") or token.get("mint")
+    if not mint:
+        return None
+    return (
+        mint,
+        token.get("symbol") or "???",
+        token.get("name") or f"Unknown Token ({mint[:6]}...)",
+        int(token.get("decimals", 9)),
+        token.get("logoURI") or token.get("logo") or "",
+    )
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, check_same_thread=False)
+    # WAL lets lookups keep reading while a background refresh writes
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+class TokenRegistry:
+    """Persistent mint -> metadata index with batch lookups."""
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH, snapshot_path: Optional[str] = DEFAULT_SNAPSHOT_PATH):
+        self.db_path = db_path
+        self.snapshot_path = snapshot_path
+        self.conn = _connect(db_path)
+        if self.count() == 0:
+            self.load_snapshot()
+
+    def count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM tokens").fetchone()[0]
+
+    def get_meta(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    @staticmethod
+    def _as_metadata(row: tuple) -> Dict[str, Any]:
+        mint, symbol, name, decimals, logo = row
+        return {"name": name, "symbol": symbol, "logo": logo, "address": mint, "decimals": decimals}
+
+    def get(self, mint: str) -> Optional[Dict[str, Any]]:
+        """Look up a single mint."""
+        row = self.conn.execute(
+            "SELECT mint, symbol, name, decimals, logo FROM tokens WHERE mint = ?", (mint,)
+        ).fetchone()
+        return self._as_metadata(row) if row else None
+
+    def get_many(self, mints: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Look up many mints at once; unknown mints are simply absent from the result."""
+        mints = list(dict.fromkeys(mints))
+        found = {}
+        for i in range(0, len(mints), LOOKUP_CHUNK):
+            chunk = mints[i:i + LOOKUP_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT mint, symbol, name, decimals, logo FROM tokens WHERE mint IN ({placeholders})", chunk
+            )
+            for row in rows:
+                found[row[0]] = self._as_metadata(row)
+        return found
+
+    def load_snapshot(self, path: Optional[str] = None) -> int:
+        """Seed the registry from a snapshot file of compact rows."""
+        path = path or self.snapshot_path
+        if not path or not os.path.exists(path):
+            logger.warning("Token registry is empty and no snapshot is available")
+            return 0
+        with open(path, encoding="utf-8") as f:
+            snapshot = json.load(f)
+        written = self._write(self.conn, (tuple(row) for row in snapshot["tokens"]),
+                              {"snapshot_generated": str(snapshot.get("generated", ""))})
+        logger.info(f"Token registry seeded with {written} tokens from {os.path.basename(path)}")
+        return written
+
+    def export_snapshot(self, path: Optional[str] = None) -> int:
+        """Write the current registry out as a snapshot file."""
+        path = path or self.snapshot_path
+        rows = self.conn.execute("SELECT mint, symbol, name, decimals, logo FROM tokens ORDER BY mint").fetchall()
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"generated": int(time.time()), "tokens": rows}, f, separators=(",", ":"))
+            f.write("\n")
+        return len(rows)
+
+    @staticmethod
+    def _write(conn: sqlite3.Connection, rows: Iterable[tuple], meta: Optional[Dict[str, str]] = None) -> int:
+        with conn:
+            before = conn.total_changes
+            conn.executemany(UPSERT, rows)
+            written = conn.total_changes - before
+            for key, value in (meta or {}).items():
+                conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+        return written
+
+    def apply_token_list(self, token_list: List[Dict[str, Any]], validators: Dict[str, str]) -> int:
+        """Merge a downloaded token list into the registry. Runs on a worker thread."""
+        conn = _connect(self.db_path)
+        try:
+            rows = (row for row in map(compact_row, token_list) if row)
+            meta = {"updated_at": str(int(time.time())), "validators": json.dumps(validators)}
+            return self._write(conn, rows, meta)
+        finally:
+            conn.close()
+
+    def needs_refresh(self, max_age: float) -> bool:
+        updated_at = float(self.get_meta("updated_at", "0"))
+        return time.time() - updated_at >= max_age
+
+    async def refresh(self, http, url: str) -> int:
+        """Fetch the token list if it changed and merge it in. Returns rows written."""
+        validators = json.loads(self.get_meta("validators", "{}"))
+        body, new_validators = await http.get_if_changed(url, validators=validators, timeout=60)
+        if body is None:
+            # Unchanged upstream - just record that we checked
+            self._write(self.conn, [], {"updated_at": str(int(time.time()))})
+            return 0
+        # The list runs to several megabytes, so it is parsed on the worker thread too
+        return await asyncio.to_thread(lambda: self.apply_token_list(json.loads(body), new_validators))
+
+    async def refresh_periodically(self, http, url: str, interval: float):
+        """Background loop keeping the registry up to date; failures leave the last snapshot in place."""
+        while True:
+            if self.needs_refresh(interval):
+                try:
+                    written = await self.refresh(http, url)
+                    logger.info(f"Token registry refreshed: {written} tokens added or changed, {self.count()} total")
+                except Exception as e:
+                    logger.error(f"Error refreshing token registry: {e}")
+            # Check again in an hour, or sooner if the interval is shorter
+            await asyncio.sleep(min(interval, 3600))
+
+    def close(self):
+        self.conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the token registry database and snapshot")
+    parser.add_argument("command", choices=["refresh", "export", "stats"])
+    parser.add_argument("--db", default=DEFAULT_DB_PATH)
+    parser.add_argument("--snapshot", default=DEFAULT_SNAPSHOT_PATH)
+    parser.add_argument("--url", default=os.environ.get("TOKEN_LIST_URL", "https://token.jup.ag/all"))
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    registry = TokenRegistry(args.db, args.snapshot)
+    if args.command == "refresh":
+        from rpc_client import SolanaRpcClient
+
+        async def run():
+            http = SolanaRpcClient(args.url)
+            try:
+                return await registry.refresh(http, args.url)
+            finally:
+                await http.close()
+        print(f"{asyncio.run(run())} tokens added or changed")
+    elif args.command == "export":
+        print(f"Wrote {registry.export_snapshot(args.snapshot)} tokens to {args.snapshot}")
+    print(f"{registry.count()} tokens in {args.db}")
+    registry.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+# Solana Address Scanner - Transaction history store
+# Per-address signature cursors backed by SQLite: incremental polling with
+# getSignaturesForAddress "until", plus a background back-fill that pages
+# through older history with "before", one page in memory at a time. A sync
+# that gives up on a very busy wallet records the gap it left, and the
+# back-fill closes it before going further back
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+from rpc_scheduler import rpc_priority, PRIORITY_BACKGROUND
+
+logger = logging.getLogger("solana_scanner")
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DB_PATH = os.path.join(BASE_DIR, "transactions.db")
+
+# getSignaturesForAddress returns at most 1000 signatures per call
+MAX_PAGE_SIZE = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS signatures (
+    address    TEXT NOT NULL,
+    signature  TEXT NOT NULL,
+    slot       INTEGER NOT NULL,
+    block_time INTEGER,
+    err        TEXT,
+    memo       TEXT,
+    status     TEXT,
+    PRIMARY KEY (address, signature)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS signatures_by_slot ON signatures (address, slot DESC);
+CREATE TABLE IF NOT EXISTS cursors (
+    address           TEXT PRIMARY KEY,
+    newest_signature  TEXT,
+    oldest_signature  TEXT,
+    backfill_complete INTEGER NOT NULL DEFAULT 0,
+    truncated         INTEGER NOT NULL DEFAULT 0,
+    updated_at        INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS gaps (
+    address          TEXT NOT NULL,
+    before_signature TEXT NOT NULL,
+    until_signature  TEXT NOT NULL,
+    PRIMARY KEY (address, until_signature)
+) WITHOUT ROWID;
+"""
+
+
+class TransactionStore:
+    """SQLite store of signatures and sync cursors per address.
+
+    Queries run in a worker thread so a slow disk never stalls the event loop.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(cursors)")]
+        if "truncated" not in columns:
+            # Stores created before back-fills recorded where they gave up
+            self.conn.execute("ALTER TABLE cursors ADD COLUMN truncated INTEGER NOT NULL DEFAULT 0")
+
+    async def _run(self, func, *args):
+        def locked():
+            with self._lock:
+                return func(*args)
+        return await asyncio.to_thread(locked)
+
+    def _cursor(self, address: str) -> Optional[Dict[str, Any]]:
+        row = self.conn.execute(
+            """SELECT newest_signature, oldest_signature, backfill_complete, truncated,
+                      EXISTS (SELECT 1 FROM gaps WHERE gaps.address = cursors.address)
+               FROM cursors WHERE address = ?""",
+            (address,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {"newest": row[0], "oldest": row[1], "backfill_complete": bool(row[2]),
+                "truncated": bool(row[3]), "gaps": bool(row[4])}
+
+    async def get_cursor(self, address: str) -> Optional[Dict[str, Any]]:
+        return await self._run(self._cursor, address)
+
+    def _insert(self, address: str, page: List[Dict[str, Any]]) -> int:
+        rows = [
+            (address, tx["signature"], tx.get("slot", 0), tx.get("blockTime"),
+             json.dumps(tx["err"]) if tx.get("err") is not None else None,
+             tx.get("memo"), tx.get("confirmationStatus"))
+            for tx in page
+        ]
+        before = self.conn.total_changes
+        self.conn.executemany("INSERT OR IGNORE INTO signatures VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        return self.conn.total_changes - before
+
+    async def add_page(self, address: str, page: List[Dict[str, Any]], newest: Optional[str] = None,
+                 oldest: Optional[str] = None, backfill_complete: Optional[bool] = None,
+                 truncated: Optional[bool] = None) -> int:
+        """Store a page of signatures and move the cursors in the same transaction."""
+        def add():
+            with self.conn:
+                inserted = self._insert(address, page)
+                self.conn.execute(
+                    "INSERT OR IGNORE INTO cursors (address, updated_at) VALUES (?, ?)", (address, int(time.time()))
+                )
+                self.conn.execute(
+                    """UPDATE cursors SET
+                           newest_signature = COALESCE(?, newest_signature),
+                           oldest_signature = COALESCE(?, oldest_signature),
+                           backfill_complete = COALESCE(?, backfill_complete),
+                           truncated = COALESCE(?, truncated),
+                           updated_at = ?
+                       WHERE address = ?""",
+                    (newest, oldest, None if backfill_complete is None else int(backfill_complete),
+                     None if truncated is None else int(truncated), int(time.time()), address)
+                )
+            return inserted
+        return await self._run(add)
+
+    async def add_gap(self, address: str, before: str, until: str):
+        """Record unsynced history between two signatures (both already stored)."""
+        def add():
+            with self.conn:
+                self.conn.execute("INSERT OR REPLACE INTO gaps VALUES (?, ?, ?)", (address, before, until))
+        await self._run(add)
+
+    async def next_gap(self, address: str) -> Optional[Dict[str, str]]:
+        row = await self._run(lambda: self.conn.execute(
+            "SELECT before_signature, until_signature FROM gaps WHERE address = ? LIMIT 1", (address,)
+        ).fetchone())
+        return {"before": row[0], "until": row[1]} if row else None
+
+    async def fill_gap(self, address: str, until: str, page: List[Dict[str, Any]], closed: bool) -> int:
+        """Store a page from inside a gap and move its boundary (or drop it once closed)."""
+        def fill():
+            with self.conn:
+                inserted = self._insert(address, page)
+                if closed:
+                    self.conn.execute("DELETE FROM gaps WHERE address = ? AND until_signature = ?",
+                                      (address, until))
+                elif page:
+                    self.conn.execute(
+                        "UPDATE gaps SET before_signature = ? WHERE address = ? AND until_signature = ?",
+                        (page[-1]["signature"], address, until)
+                    )
+            return inserted
+        return await self._run(fill)
+
+    async def recent(self, address: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Latest signatures, newest first, in getSignaturesForAddress format."""
+        rows = await self._run(lambda: self.conn.execute(
+            """SELECT signature, slot, block_time, err, memo, status FROM signatures
+               WHERE address = ? ORDER BY slot DESC LIMIT ?""",
+            (address, limit)
+        ).fetchall())
+        return [
+            {
+                "signature": signature,
+                "slot": slot,
+                "blockTime": block_time,
+                "err": json.loads(err) if err is not None else None,
+                "memo": memo,
+                "confirmationStatus": status
+            }
+            for signature, slot, block_time, err, memo, status in rows
+        ]
+
+    async def history_stats(self, address: str) -> Optional[Dict[str, Any]]:
+        """Wallet age and activity signals from the stored history, or None if never synced."""
+        def stats():
+            cursor = self._cursor(address)
+            if cursor is None:
+                return None, None
+            now = int(time.time())
+            return cursor, self.conn.execute(
+                """SELECT COUNT(*), MIN(block_time), MAX(block_time),
+                          SUM(err IS NOT NULL),
+                          SUM(block_time >= ?), SUM(block_time >= ?)
+                   FROM signatures WHERE address = ?""",
+                (now - 7 * 86400, now - 30 * 86400, address)
+            ).fetchone()
+        cursor, row = await self._run(stats)
+        if cursor is None:
+            return None
+        count, oldest, newest, failed, last_7d, last_30d = row
+        return {
+            "transactionCount": count,
+            "failedCount": failed or 0,
+            "oldestBlockTime": oldest,
+            "newestBlockTime": newest,
+            "last7Days": last_7d or 0,
+            "last30Days": last_30d or 0,
+            # A back-fill stopped at TX_BACKFILL_MAX never reached the first transaction
+            "historyComplete": cursor["backfill_complete"] and not cursor["gaps"] and not cursor["truncated"],
+            "truncated": cursor["truncated"]
+        }
+
+    async def count(self, address: str) -> int:
+        row = await self._run(lambda: self.conn.execute(
+            "SELECT COUNT(*) FROM signatures WHERE address = ?", (address,)).fetchone())
+        return row[0]
+
+    async def incomplete_backfills(self) -> List[str]:
+        rows = await self._run(lambda: self.conn.execute(
+            "SELECT address FROM cursors WHERE backfill_complete = 0 UNION SELECT address FROM gaps").fetchall())
+        return [row[0] for row in rows]
+
+    async def close(self):
+        await self._run(self.conn.close)
+
+
+class TransactionIngester:
+    """Keeps the store in sync with the chain for each address."""
+
+    def __init__(self, store: TransactionStore, rpc, initial_page: int = 100, page_size: int = MAX_PAGE_SIZE,
+                 max_sync_pages: int = 10, backfill_max: int = 50000, backfill_workers: int = 2):
+        self.store = store
+        self.rpc = rpc
+        self.initial_page = min(initial_page, MAX_PAGE_SIZE)
+        self.page_size = min(page_size, MAX_PAGE_SIZE)
+        self.max_sync_pages = max_sync_pages
+        self.backfill_max = backfill_max
+        self.backfill_workers = backfill_workers
+        self._locks: Dict[str, List] = {}  # address -> [lock, tasks holding or waiting for it]
+        self._queue: Optional[asyncio.Queue] = None
+        self._queued = set()
+        self._stopped = set()  # Addresses no longer tracked; their back-fills end at the next page
+        self._workers: List[asyncio.Task] = []
+        self._owns: Optional[Callable[[str], bool]] = None
+
+    @asynccontextmanager
+    async def _lock(self, address: str):
+        # Per-address lock, dropped once nobody holds or waits for it
+        entry = self._locks.get(address)
+        if entry is None:
+            entry = self._locks[address] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self._locks[address]
+
+    async def _page(self, address: str, limit: int, before: Optional[str] = None,
+                    until: Optional[str] = None) -> List[Dict[str, Any]]:
+        options = {"limit": limit}
+        if before:
+            options["before"] = before
+        if until:
+            options["until"] = until
+        result = await self.rpc.call("getSignaturesForAddress", [address, options])
+        if not isinstance(result, list):
+            raise ValueError(f"Unexpected response format: {result}")
+        return result
+
+    async def sync(self, address: str) -> bool:
+        """Fetch only the signatures newer than the stored cursor.
+
+        For a wallet with no new activity this is a single small RPC call.
+        Returns False if the chain could not be reached.
+        """
+        async with self._lock(address):
+            try:
+                cursor = await self.store.get_cursor(address)
+                if cursor is None or cursor["newest"] is None:
+                    page = await self._page(address, self.initial_page)
+                    await self.store.add_page(
+                        address, page,
+                        newest=page[0]["signature"] if page else None,
+                        oldest=page[-1]["signature"] if page else None,
+                        backfill_complete=len(page) < self.initial_page
+                    )
+                else:
+                    await self._sync_newer(address, cursor["newest"])
+            except Exception as e:
+                logger.error(f"Error syncing transactions for {address}: {e}")
+                return False
+
+        cursor = await self.store.get_cursor(address)
+        if cursor and (not cursor["backfill_complete"] or cursor["gaps"]) and self._owned(address):
+            self.schedule_backfill(address)
+        return True
+
+    async def _sync_newer(self, address: str, until: str):
+        # Pages run newest to oldest; the newest cursor only moves once the gap
+        # back to the old cursor is closed, or recorded for the back-fill to
+        # close when we give up on a very busy wallet
+        newest = None
+        before = None
+        for _ in range(self.max_sync_pages):
+            page = await self._page(address, self.page_size, before=before, until=until)
+            if not page:
+                break
+            newest = newest or page[0]["signature"]
+            await self.store.add_page(address, page)
+            if len(page) < self.page_size:
+                break
+            before = page[-1]["signature"]
+        else:
+            logger.warning(f"More than {self.max_sync_pages * self.page_size} new signatures for {address}; "
+                           f"leaving the rest to the back-fill")
+            await self.store.add_gap(address, before, until)
+        if newest:
+            await self.store.add_page(address, [], newest=newest)
+
+    async def backfill(self, address: str):
+        """Page through older history in the background, one page in memory at a time."""
+        rpc_priority.set(PRIORITY_BACKGROUND)
+        stored = await self.store.count(address)
+        while True:
+            if address in self._stopped:
+                return
+            # Recent history missed by a sync comes before anything older
+            gap = await self.store.next_gap(address)
+            if gap is not None:
+                page = await self._page(address, self.page_size, before=gap["before"], until=gap["until"])
+                closed = len(page) < self.page_size
+                await self.store.fill_gap(address, gap["until"], page, closed)
+                stored += len(page)
+                if closed:
+                    logger.info(f"Closed a sync gap in the history of {address}")
+                continue
+
+            cursor = await self.store.get_cursor(address)
+            if cursor is None or cursor["backfill_complete"]:
+                return
+            if stored >= self.backfill_max:
+                logger.info(f"Back-fill for {address} stopped at {stored} signatures (TX_BACKFILL_MAX)")
+                await self.store.add_page(address, [], backfill_complete=True, truncated=True)
+                return
+
+            page = await self._page(address, self.page_size, before=cursor["oldest"])
+            done = len(page) < self.page_size
+            await self.store.add_page(
+                address, page,
+                oldest=page[-1]["signature"] if page else None,
+                backfill_complete=done
+            )
+            stored += len(page)
+            if done:
+                logger.info(f"Back-fill for {address} complete")
+                return
+
+    def schedule_backfill(self, address: str):
+        self._stopped.discard(address)
+        if self._queue is None or address in self._queued:
+            return
+        self._queued.add(address)
+        self._queue.put_nowait(address)
+
+    async def _worker(self):
+        while True:
+            address = await self._queue.get()
+            try:
+                await self.backfill(address)
+            except Exception as e:
+                # The cursor is persisted, so the next sync picks it up again
+                logger.error(f"Error back-filling transactions for {address}: {e}")
+            finally:
+                self._queued.discard(address)
+
+    def stop_backfill(self, address: str):
+        """Stop back-filling an address that is no longer tracked; the cursor keeps its progress."""
+        if address in self._queued:
+            self._stopped.add(address)
+
+    def _owned(self, address: str) -> bool:
+        return self._owns is None or self._owns(address)
+
+    async def start(self, owns: Optional[Callable[[str], bool]] = None):
+        """Start the back-fill workers and resume any back-fills left over from a previous run.
+
+        With several workers sharing the store, `owns` limits back-fills (both
+        resumed ones and those started by a sync) to the addresses this worker
+        is responsible for.
+        """
+        self._owns = owns
+        self._queue = asyncio.Queue()
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.backfill_workers)]
+        for address in await self.store.incomplete_backfills():
+            if self._owned(address):
+                self.schedule_backfill(address)
+
+    def stop(self):
+        for worker in self._workers:
+            worker.cancel()
+        self._workers = []